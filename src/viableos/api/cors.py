@@ -0,0 +1,97 @@
+"""Minimal CORS middleware for the fixed set of dev-server origins."""
+
+from __future__ import annotations
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+ALLOWED_ORIGINS = frozenset({b"http://localhost:5173", b"http://localhost:3000"})
+
+_ALLOW_METHODS = b"DELETE, GET, HEAD, OPTIONS, PATCH, POST, PUT"
+
+# Headers added to every response for an allowed origin (besides the origin itself).
+_CORS_HEADERS = [
+    (b"access-control-allow-credentials", b"true"),
+    (b"vary", b"Origin"),
+]
+
+_PREFLIGHT_HEADERS = [
+    *_CORS_HEADERS,
+    (b"access-control-allow-methods", _ALLOW_METHODS),
+    (b"access-control-max-age", b"600"),
+    (b"content-length", b"0"),
+]
+
+_PREFLIGHT_START: Message = {"type": "http.response.start", "status": 204}
+_PREFLIGHT_BODY: Message = {"type": "http.response.body", "body": b""}
+
+_DISALLOWED_BODY = b"Disallowed CORS origin"
+_DISALLOWED_START: Message = {
+    "type": "http.response.start",
+    "status": 400,
+    "headers": [
+        (b"content-type", b"text/plain; charset=utf-8"),
+        (b"content-length", str(len(_DISALLOWED_BODY)).encode()),
+    ],
+}
+_DISALLOWED_BODY_MSG: Message = {"type": "http.response.body", "body": _DISALLOWED_BODY}
+
+
+class CORSMiddleware:
+    """Credentialed CORS for ``ALLOWED_ORIGINS`` with all methods and headers allowed.
+
+    Behaves like Starlette's ``CORSMiddleware`` configured with those origins,
+    ``allow_credentials=True`` and ``"*"`` methods/headers, but does the work
+    on raw ASGI header tuples with every constant header encoded up front.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        origin = None
+        request_method = None
+        request_headers = None
+        for name, value in scope["headers"]:
+            if name == b"origin":
+                origin = value
+            elif name == b"access-control-request-method":
+                request_method = value
+            elif name == b"access-control-request-headers":
+                request_headers = value
+
+        if origin is None:
+            await self.app(scope, receive, send)
+            return
+
+        allowed = origin in ALLOWED_ORIGINS
+
+        if scope["method"] == "OPTIONS" and request_method is not None:
+            if not allowed:
+                await send(_DISALLOWED_START)
+                await send(_DISALLOWED_BODY_MSG)
+                return
+            headers = [(b"access-control-allow-origin", origin), *_PREFLIGHT_HEADERS]
+            if request_headers is not None:
+                headers.append((b"access-control-allow-headers", request_headers))
+            await send({**_PREFLIGHT_START, "headers": headers})
+            await send(_PREFLIGHT_BODY)
+            return
+
+        if not allowed:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_cors(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = [
+                    *message.get("headers", ()),
+                    (b"access-control-allow-origin", origin),
+                    *_CORS_HEADERS,
+                ]
+            await send(message)
+
+        await self.app(scope, receive, send_with_cors)
@@ -3,8 +3,8 @@
 from __future__ import annotations
 
 from fastapi import FastAPI
-from fastapi.middleware.cors import CORSMiddleware
 
+from viableos.api.cors import CORSMiddleware
 from viableos.api.routes import router
 from viableos.api.chat_routes import chat_router
 from viableos.api.ops_routes import ops_router
@@ -15,13 +15,7 @@ app = FastAPI(
     description="REST API for the ViableOS multi-agent design tool",
 )
 
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["http://localhost:5173", "http://localhost:3000"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+app.add_middleware(CORSMiddleware)
 
 app.include_router(router)
 app.include_router(chat_router)
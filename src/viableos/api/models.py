@@ -37,6 +37,11 @@ class BudgetPlanResponse(BaseModel):
     model_routing: dict[str, str]
 
 
+class PrepareResponse(BaseModel):
+    errors: list[str]
+    budget: BudgetPlanResponse | None
+
+
 class CheckResultResponse(BaseModel):
     system: str
     name: str
@@ -0,0 +1,21 @@
+"""Response classes for the ViableOS API."""
+
+from __future__ import annotations
+
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+
+
+class ORJSONResponse(JSONResponse):
+    """JSON response rendered with orjson instead of the stdlib encoder.
+
+    Only returned explicitly from routes that build plain dicts or dataclasses.
+    It is deliberately not the app's ``default_response_class``: FastAPI only
+    serializes validated return values with Pydantic's ``dump_json`` while the
+    default class is left in place, and that path is faster than this one.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
@@ -2,31 +2,39 @@
 
 from __future__ import annotations
 
-import shutil
+import asyncio
+import functools
+import hashlib
+import io
+import os
 import tempfile
+import zipfile
+from collections.abc import Callable
 from pathlib import Path
 from typing import Any
 
-from fastapi import APIRouter, HTTPException
-from fastapi.responses import FileResponse
+import orjson
+import yaml
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import Response
 
 from viableos.api.models import (
-    BudgetAllocationResponse,
     BudgetPlanResponse,
-    CheckResultResponse,
     CoordinationRule,
     ModelInfo,
+    PrepareResponse,
     PresetsResponse,
     TemplateItem,
     ViabilityReportResponse,
-    WarningResponse,
 )
+from viableos.api.responses import ORJSONResponse
 from viableos.budget import (
     AGENT_RELIABILITY_LABELS,
     MODEL_CATALOG,
     MODEL_PRESETS,
     MODEL_TIERS,
     MODEL_WARNINGS,
+    BudgetPlan,
     calculate_budget,
     get_models_for_provider,
 )
@@ -37,8 +45,15 @@ from viableos.assessment_transformer import transform_assessment
 from viableos.langgraph_generator import generate_langgraph_package
 from viableos.schema import validate
 
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader as _YamlLoader
+
 TEMPLATES_DIR = Path(__file__).parent.parent / "templates"
 
+_TEMPLATE_KEYS = frozenset(p.stem for p in TEMPLATES_DIR.glob("*.yaml"))
+
 TEMPLATE_INFO: dict[str, dict[str, Any]] = {
     "custom": {
         "name": "Start from Scratch",
@@ -203,52 +218,9 @@ PERSISTENCE_STRATEGIES = {
     "none": "None — state is lost when sessions end (not recommended for production)",
 }
 
-router = APIRouter(prefix="/api")
-
-
-@router.get("/templates")
-def list_templates() -> list[TemplateItem]:
-    return [
-        TemplateItem(key=key, **info)
-        for key, info in TEMPLATE_INFO.items()
-    ]
-
-
-@router.get("/templates/{key}")
-def get_template(key: str) -> dict[str, Any]:
-    if key == "custom":
-        return {"viable_system": {"name": "", "identity": {"purpose": ""}, "system_1": []}}
-    path = TEMPLATES_DIR / f"{key}.yaml"
-    if not path.exists():
-        raise HTTPException(status_code=404, detail=f"Template '{key}' not found")
-    import yaml
-    with open(path) as f:
-        return yaml.safe_load(f)
-
-
-@router.get("/models")
-def list_models() -> list[ModelInfo]:
-    return [
-        ModelInfo(
-            id=model_id,
-            provider=info["provider"],
-            tier=info["tier"],
-            note=info["note"],
-            agent_reliability=info["agent_reliability"],
-            warning=MODEL_WARNINGS.get(model_id),
-        )
-        for model_id, info in MODEL_CATALOG.items()
-    ]
-
-
-@router.get("/models/{provider}")
-def list_models_by_provider(provider: str) -> list[str]:
-    return get_models_for_provider(provider)
-
-
-@router.get("/presets")
-def get_presets() -> PresetsResponse:
-    return PresetsResponse(
+# Static payloads are serialized once at import — they only change on deploy.
+_PRESETS_JSON = orjson.dumps(
+    PresetsResponse(
         values=VALUE_PRESETS,
         autonomy_levels=AUTONOMY_LEVELS,
         tool_categories=TOOL_CATEGORIES,
@@ -261,73 +233,177 @@ def get_presets() -> PresetsResponse:
         model_tiers=MODEL_TIERS,
         agent_reliability_labels=AGENT_RELIABILITY_LABELS,
         strategy_presets=list(MODEL_PRESETS.keys()),
-    )
+    ).model_dump()
+)
 
+_TEMPLATES_JSON = orjson.dumps([
+    TemplateItem(key=key, **info).model_dump()
+    for key, info in TEMPLATE_INFO.items()
+])
+
+_MODELS_JSON = orjson.dumps([
+    {
+        "id": model_id,
+        "provider": info["provider"],
+        "tier": info["tier"],
+        "note": info["note"],
+        "agent_reliability": info["agent_reliability"],
+        "warning": MODEL_WARNINGS.get(model_id),
+    }
+    for model_id, info in MODEL_CATALOG.items()
+])
+
+_CUSTOM_TEMPLATE_JSON = orjson.dumps(
+    {"viable_system": {"name": "", "identity": {"purpose": ""}, "system_1": []}}
+)
+
+
+_CACHE_CONTROL = "public, max-age=300"
+
+
+def _etag(body: bytes) -> str:
+    return f'"{hashlib.sha256(body).hexdigest()}"'
 
-@router.post("/validate")
-def validate_config(config: dict[str, Any]) -> list[str]:
-    return validate(config)
-
-
-@router.post("/budget")
-def compute_budget(config: dict[str, Any]) -> BudgetPlanResponse:
-    plan = calculate_budget(config)
-    return BudgetPlanResponse(
-        total_monthly_usd=plan.total_monthly_usd,
-        strategy=plan.strategy,
-        allocations=[
-            BudgetAllocationResponse(
-                system=a.system,
-                friendly_name=a.friendly_name,
-                monthly_usd=a.monthly_usd,
-                model=a.model,
-                percentage=a.percentage,
-            )
-            for a in plan.allocations
-        ],
-        model_routing=plan.model_routing,
-    )
 
+_PRESETS_ETAG = _etag(_PRESETS_JSON)
+_TEMPLATES_ETAG = _etag(_TEMPLATES_JSON)
+_MODELS_ETAG = _etag(_MODELS_JSON)
+_CUSTOM_TEMPLATE_ETAG = _etag(_CUSTOM_TEMPLATE_JSON)
 
-@router.post("/check")
-def run_check(config: dict[str, Any]) -> ViabilityReportResponse:
-    report = check_viability(config)
-    return ViabilityReportResponse(
-        score=report.score,
-        total=report.total,
-        checks=[
-            CheckResultResponse(
-                system=c.system,
-                name=c.name,
-                present=c.present,
-                details=c.details,
-                suggestions=c.suggestions,
-            )
-            for c in report.checks
-        ],
-        warnings=[
-            WarningResponse(
-                category=w.category,
-                severity=w.severity,
-                message=w.message,
-                suggestion=w.suggestion,
-            )
-            for w in report.warnings
-        ],
+
+def _static_payload(data: Any) -> tuple[bytes, str]:
+    body = orjson.dumps(data)
+    return body, _etag(body)
+
+
+_PROVIDER_MODELS = {
+    provider: _static_payload(get_models_for_provider(provider))
+    for provider in {"mixed", *(info["provider"] for info in MODEL_CATALOG.values())}
+}
+_NO_MODELS = _static_payload([])
+
+
+@functools.cache
+def _load_template_json(key: str) -> tuple[bytes, str]:
+    """Parse a template once per process and keep its JSON encoding and ETag."""
+    with open(TEMPLATES_DIR / f"{key}.yaml") as f:
+        body = orjson.dumps(yaml.load(f, Loader=_YamlLoader))
+    return body, _etag(body)
+
+
+def _static_json(request: Request, body: bytes, etag: str) -> Response:
+    """Serve a pre-encoded payload, or an empty 304 if the client already has it."""
+    headers = {"etag": etag, "cache-control": _CACHE_CONTROL}
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and (
+        if_none_match.strip() == "*"
+        or etag in (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))
+    ):
+        return Response(status_code=304, headers=headers)
+    return Response(body, media_type="application/json", headers=headers)
+
+
+router = APIRouter(prefix="/api")
+
+
+@router.get("/templates", response_model=list[TemplateItem])
+def list_templates(request: Request) -> Response:
+    return _static_json(request, _TEMPLATES_JSON, _TEMPLATES_ETAG)
+
+
+@router.get("/templates/{key}")
+def get_template(key: str, request: Request) -> Response:
+    if key == "custom":
+        return _static_json(request, _CUSTOM_TEMPLATE_JSON, _CUSTOM_TEMPLATE_ETAG)
+    if key not in _TEMPLATE_KEYS:
+        raise HTTPException(status_code=404, detail=f"Template '{key}' not found")
+    return _static_json(request, *_load_template_json(key))
+
+
+@router.get("/models", response_model=list[ModelInfo])
+def list_models(request: Request) -> Response:
+    return _static_json(request, _MODELS_JSON, _MODELS_ETAG)
+
+
+@router.get("/models/{provider}", response_model=list[str])
+def list_models_by_provider(provider: str, request: Request) -> Response:
+    return _static_json(request, *_PROVIDER_MODELS.get(provider, _NO_MODELS))
+
+
+@router.get("/presets", response_model=PresetsResponse)
+def get_presets(request: Request) -> Response:
+    return _static_json(request, _PRESETS_JSON, _PRESETS_ETAG)
+
+
+# Config endpoints read the raw body and decode it with orjson in one pass
+# instead of FastAPI's stdlib json + dict[str, Any] validation. The schema is
+# still advertised so the OpenAPI docs keep a request body.
+_CONFIG_BODY = {
+    "requestBody": {
+        "required": True,
+        "content": {"application/json": {"schema": {"type": "object"}}},
+    },
+}
+
+
+async def _read_config(request: Request) -> dict[str, Any]:
+    try:
+        config = orjson.loads(await request.body())
+    except orjson.JSONDecodeError as e:
+        raise HTTPException(status_code=422, detail=f"Invalid JSON body: {e}") from e
+    if not isinstance(config, dict):
+        raise HTTPException(status_code=422, detail="Request body must be a JSON object")
+    return config
+
+
+@router.post("/validate", response_model=list[str], openapi_extra=_CONFIG_BODY)
+async def validate_config(request: Request) -> ORJSONResponse:
+    config = await _read_config(request)
+    return ORJSONResponse(await asyncio.to_thread(validate, config))
+
+
+@router.post("/budget", response_model=BudgetPlanResponse, openapi_extra=_CONFIG_BODY)
+async def compute_budget(request: Request) -> ORJSONResponse:
+    config = await _read_config(request)
+    # BudgetPlan and its allocations are dataclasses that orjson serializes natively.
+    return ORJSONResponse(calculate_budget(config))
+
+
+async def _budget_or_none(config: dict[str, Any]) -> BudgetPlan | None:
+    # calculate_budget assumes a schema-valid shape and raises on anything else.
+    try:
+        return await asyncio.to_thread(calculate_budget, config)
+    except (AttributeError, KeyError, TypeError, ValueError):
+        return None
+
+
+@router.post("/prepare", response_model=PrepareResponse, openapi_extra=_CONFIG_BODY)
+async def prepare_config(request: Request) -> ORJSONResponse:
+    """Validate and budget a config in one round trip, both passes in parallel.
+
+    ``budget`` is ``null`` when the config is too malformed to budget; the
+    validation errors are still returned so the client can report them.
+    """
+    config = await _read_config(request)
+    errors, plan = await asyncio.gather(
+        asyncio.to_thread(validate, config),
+        _budget_or_none(config),
     )
+    return ORJSONResponse({"errors": errors, "budget": plan})
+
+
+@router.post("/check", response_model=ViabilityReportResponse, openapi_extra=_CONFIG_BODY)
+async def run_check(request: Request) -> ORJSONResponse:
+    config = await _read_config(request)
+    return ORJSONResponse(check_viability(config))
 
 
-@router.post("/coordination/rules")
-def auto_generate_rules(units: list[dict[str, Any]]) -> list[CoordinationRule]:
-    rules = generate_base_rules(units)
-    return [
-        CoordinationRule(
-            trigger=r.get("trigger", ""),
-            action=r.get("action", ""),
-            scope=r.get("scope", ""),
-        )
-        for r in rules
-    ]
+@router.post("/coordination/rules", response_model=list[CoordinationRule])
+def auto_generate_rules(units: list[dict[str, Any]]) -> ORJSONResponse:
+    return ORJSONResponse([
+        {"trigger": r.get("trigger", ""), "action": r.get("action", ""), "scope": r.get("scope", "")}
+        for r in generate_base_rules(units)
+    ])
 
 
 @router.post("/assessment/transform")
@@ -336,38 +412,55 @@ def transform_assessment_endpoint(assessment: dict[str, Any]) -> dict[str, Any]:
     return transform_assessment(assessment)
 
 
-@router.post("/generate")
-def generate_package(config: dict[str, Any]) -> FileResponse:
-    errors = validate(config)
+def _zip_dir(src: Path) -> bytes:
+    """Zip *src* in memory, entries relative to *src*."""
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w", zipfile.ZIP_DEFLATED, compresslevel=1) as zf:
+        for dirpath, _dirnames, filenames in os.walk(src):
+            for filename in filenames:
+                file_path = os.path.join(dirpath, filename)
+                zf.write(file_path, os.path.relpath(file_path, src))
+    return buf.getvalue()
+
+
+def _build_package_zip(
+    config: dict[str, Any],
+    generate: Callable[[dict[str, Any], Path], Path],
+    name: str,
+) -> bytes:
+    """Generate a package into a scratch dir and return it as zip bytes.
+
+    Runs off the event loop. The archive never touches disk, and the scratch
+    dir is gone by the time the response is built.
+    """
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        return _zip_dir(generate(config, Path(tmp_dir) / name))
+
+
+async def _package_response(
+    config: dict[str, Any],
+    generate: Callable[[dict[str, Any], Path], Path],
+    name: str,
+) -> Response:
+    errors = await asyncio.to_thread(validate, config)
     if errors:
         raise HTTPException(status_code=422, detail=errors)
 
-    tmp_dir = tempfile.mkdtemp()
-    out_path = generate_openclaw_package(config, Path(tmp_dir) / "viableos-openclaw")
-
-    zip_path = shutil.make_archive(str(out_path), "zip", str(out_path))
+    archive = await asyncio.to_thread(_build_package_zip, config, generate, name)
 
-    return FileResponse(
-        path=zip_path,
-        filename="viableos-openclaw.zip",
+    return Response(
+        archive,
         media_type="application/zip",
+        headers={"content-disposition": f'attachment; filename="{name}.zip"'},
     )
 
 
-@router.post("/generate/langgraph")
-def generate_langgraph(config: dict[str, Any]) -> FileResponse:
-    """Generate a LangGraph deployment package."""
-    errors = validate(config)
-    if errors:
-        raise HTTPException(status_code=422, detail=errors)
-
-    tmp_dir = tempfile.mkdtemp()
-    out_path = generate_langgraph_package(config, Path(tmp_dir) / "viableos-langgraph")
+@router.post("/generate")
+async def generate_package(config: dict[str, Any]) -> Response:
+    return await _package_response(config, generate_openclaw_package, "viableos-openclaw")
 
-    zip_path = shutil.make_archive(str(out_path), "zip", str(out_path))
 
-    return FileResponse(
-        path=zip_path,
-        filename="viableos-langgraph.zip",
-        media_type="application/zip",
-    )
+@router.post("/generate/langgraph")
+async def generate_langgraph(config: dict[str, Any]) -> Response:
+    """Generate a LangGraph deployment package."""
+    return await _package_response(config, generate_langgraph_package, "viableos-langgraph")
@@ -2,9 +2,13 @@
 
 from __future__ import annotations
 
+import functools
+from collections.abc import Sequence
 from typing import Any
 
 import plotly.graph_objects as go
+from jinja2 import Environment
+from markupsafe import escape
 
 VIABLEOS_COLORS = {
     "primary": "#6366f1",
@@ -30,86 +34,50 @@ _VSM_COLORS = {
 }
 
 
-def vsm_diagram_html(config: dict[str, Any]) -> str:
-    """Generate an HTML VSM diagram matching the reference layout."""
-    vs = config.get("viable_system", {})
-    identity = vs.get("identity", {})
-    s1_units = vs.get("system_1", [])
-    s2_rules = vs.get("system_2", {}).get("coordination_rules", [])
-    s3_cfg = vs.get("system_3", {})
-    s3star_cfg = vs.get("system_3_star", {})
-    s4_cfg = vs.get("system_4", {})
-    hitl = vs.get("human_in_the_loop", {})
+# Static markup is rendered once at import with the (constant) colors baked
+# in; only the per-config fields are left as ``str.format_map`` placeholders.
+# The repeated per-item fragments are compiled Jinja loops with autoescaping,
+# so user-supplied names and purposes are escaped by markupsafe's C speedups.
+_JINJA = Environment(autoescape=True)
 
-    has_s2 = bool(s2_rules)
-    has_s3 = bool(s3_cfg.get("reporting_rhythm") or s3_cfg.get("resource_allocation"))
-    has_s3star = bool(s3star_cfg.get("checks"))
-    has_s4 = bool(s4_cfg.get("monitoring"))
+_NOT_CONFIGURED_HTML = '<div style="font-size:11px;color:#64748b;font-style:italic;">Not configured yet</div>'
 
-    # S1 unit items
-    unit_html = ""
-    for u in s1_units:
-        unit_html += f"""<div style="display:flex;align-items:baseline;gap:6px;font-size:11px;
+_UNITS_TMPL = _JINJA.from_string(
+    """{% for u in units %}<div style="display:flex;align-items:baseline;gap:6px;font-size:11px;
             color:#cbd5e1;padding:2px 0;">
             <span style="color:#94a3b8;font-size:8px;">●</span>
-            <strong style="color:#f8fafc;">{u.get('name','?')}</strong> — {u.get('purpose','')[:50]}
-        </div>"""
-
-    # S2 rules
-    rules_html = ""
-    for r in s2_rules[:4]:
-        trigger = r.get('trigger', '')
-        action = r.get('action', '')
-        rules_html += f"""<div style="font-size:11px;color:{_VSM_COLORS['s2']['text']};padding:2px 0 2px 12px;position:relative;
+            <strong style="color:#f8fafc;">{{ u.get("name", "?") }}</strong> — {{ u.get("purpose", "")[:50] }}
+        </div>{% endfor %}"""
+)
+
+_RULES_TMPL = _JINJA.from_string(
+    """{% for r in rules[:4] %}<div style="font-size:11px;color:{{ color }};padding:2px 0 2px 12px;position:relative;
             line-height:1.35;">
             <span style="position:absolute;left:0;font-weight:700;">›</span>
-            {trigger} &rarr; {action}
-        </div>"""
-    if len(s2_rules) > 4:
-        rules_html += f'<div style="font-size:10px;color:#64748b;margin-top:2px;">+ {len(s2_rules) - 4} more rules</div>'
-    if not rules_html:
-        rules_html = '<div style="font-size:11px;color:#64748b;font-style:italic;">Not configured yet</div>'
-
-    # S3 info
-    s3_rhythm = s3_cfg.get("reporting_rhythm", "—")
-    s3_alloc = s3_cfg.get("resource_allocation", "—")
-
-    # S3* checks
-    checks_html = ""
-    for c in s3star_cfg.get("checks", [])[:3]:
-        checks_html += f"""<div style="font-size:11px;color:{_VSM_COLORS['s3star']['text']};padding:2px 0 2px 12px;position:relative;">
+            {{ r.get("trigger", "") }} &rarr; {{ r.get("action", "") }}
+        </div>{% endfor %}"""
+    """{% if rules|length > 4 %}<div style="font-size:10px;color:#64748b;margin-top:2px;">+ {{ rules|length - 4 }} more rules</div>{% endif %}""",
+    globals={"color": _VSM_COLORS["s2"]["text"]},
+)
+
+_CHECKS_TMPL = _JINJA.from_string(
+    """{% for c in checks[:3] %}<div style="font-size:11px;color:{{ color }};padding:2px 0 2px 12px;position:relative;">
             <span style="position:absolute;left:0;font-weight:700;">›</span>
-            <strong>{c.get('name','')}</strong> → {c.get('target','')}
-        </div>"""
-    if not checks_html:
-        checks_html = '<div style="font-size:11px;color:#64748b;font-style:italic;">Not configured yet</div>'
-
-    # S4 monitoring
-    monitoring = s4_cfg.get("monitoring", {})
-    s4_items = monitoring.get("competitors", [])[:2] + monitoring.get("technology", [])[:2]
-    s4_html = ""
-    for item in s4_items:
-        s4_html += f"""<div style="font-size:11px;color:{_VSM_COLORS['s4']['text']};padding:2px 0 2px 12px;position:relative;">
-            <span style="position:absolute;left:0;font-weight:700;">›</span>{item}
-        </div>"""
-    if not s4_html:
-        s4_html = '<div style="font-size:11px;color:#64748b;font-style:italic;">Not configured yet</div>'
-
-    # S5 info
-    purpose = identity.get("purpose", "—")
-    values = identity.get("values", [])
-    never_do = identity.get("never_do", [])
-    values_html = ", ".join(values[:3]) if values else "—"
-    never_do_html = f"<div style='font-size:10px;color:#fca5a5;margin-top:4px;'>{len(never_do)} hard boundaries</div>" if never_do else ""
+            <strong>{{ c.get("name", "") }}</strong> → {{ c.get("target", "") }}
+        </div>{% endfor %}""",
+    globals={"color": _VSM_COLORS["s3star"]["text"]},
+)
 
-    # HiTL summary for S5 box
-    approval_count = len(hitl.get("approval_required", []))
-    emergency_count = len(hitl.get("emergency_alerts", []))
+_S4_ITEMS_TMPL = _JINJA.from_string(
+    """{% for item in items %}<div style="font-size:11px;color:{{ color }};padding:2px 0 2px 12px;position:relative;">
+            <span style="position:absolute;left:0;font-weight:700;">›</span>{{ item }}
+        </div>{% endfor %}""",
+    globals={"color": _VSM_COLORS["s4"]["text"]},
+)
 
-    def _opacity(present: bool) -> str:
-        return "1.0" if present else "0.5"
+_NEVER_DO_TMPL = "<div style='font-size:10px;color:#fca5a5;margin-top:4px;'>{count} hard boundaries</div>"
 
-    return f"""
+_VSM_SHELL = f"""
     <div style="font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', sans-serif;
         display: grid;
         grid-template-columns: 1fr 1fr;
@@ -128,36 +96,36 @@ def vsm_diagram_html(config: dict[str, Any]) -> str:
                 Identity & Policy
             </div>
             <div style="font-size:11px;color:{_VSM_COLORS['s5']['text']};margin-bottom:4px;">
-                {purpose[:80]}
+                {{purpose}}
             </div>
             <div style="font-size:10px;color:#a5b4fc;margin-top:6px;">
-                Values: {values_html}
+                Values: {{values_html}}
             </div>
             <div style="font-size:10px;color:#a5b4fc;">
-                {approval_count} approval gates | {emergency_count} emergency alerts
+                {{approval_count}} approval gates | {{emergency_count}} emergency alerts
             </div>
-            {never_do_html}
+            {{never_do_html}}
         </div>
 
         <!-- S4: Intelligence — top right -->
         <div style="background: {_VSM_COLORS['s4']['bg']};
             border: 2px solid {_VSM_COLORS['s4']['border']};
             border-radius: 10px; padding: 14px; grid-column: 2; grid-row: 1;
-            opacity: {_opacity(has_s4)};">
+            opacity: {{s4_opacity}};">
             <span style="display:inline-block;font-size:10px;font-weight:700;padding:2px 8px;
                 border-radius:4px;background:{_VSM_COLORS['s4']['badge']};color:#fff;
                 margin-bottom:6px;letter-spacing:0.5px;">S4</span>
             <div style="font-size:14px;font-weight:700;color:#cffafe;margin-bottom:6px;">
                 Intelligence (Scout)
             </div>
-            {s4_html}
+            {{s4_html}}
         </div>
 
         <!-- S3*: Audit — middle left -->
         <div style="background: {_VSM_COLORS['s3star']['bg']};
             border: 2px solid {_VSM_COLORS['s3star']['border']};
             border-radius: 10px; padding: 14px; grid-column: 1; grid-row: 2;
-            opacity: {_opacity(has_s3star)};">
+            opacity: {{s3star_opacity}};">
             <span style="display:inline-block;font-size:10px;font-weight:700;padding:2px 8px;
                 border-radius:4px;background:{_VSM_COLORS['s3star']['badge']};color:#fff;
                 margin-bottom:6px;letter-spacing:0.5px;">S3*</span>
@@ -167,14 +135,14 @@ def vsm_diagram_html(config: dict[str, Any]) -> str:
             <div style="font-size:10px;color:#f9a8d4;margin-bottom:4px;">
                 Independent verification — different AI provider
             </div>
-            {checks_html}
+            {{checks_html}}
         </div>
 
         <!-- S3: Optimization — middle right -->
         <div style="background: {_VSM_COLORS['s3']['bg']};
             border: 2px solid {_VSM_COLORS['s3']['border']};
             border-radius: 10px; padding: 14px; grid-column: 2; grid-row: 2;
-            opacity: {_opacity(has_s3)};">
+            opacity: {{s3_opacity}};">
             <span style="display:inline-block;font-size:10px;font-weight:700;padding:2px 8px;
                 border-radius:4px;background:{_VSM_COLORS['s3']['badge']};color:#fff;
                 margin-bottom:6px;letter-spacing:0.5px;">S3</span>
@@ -182,10 +150,10 @@ def vsm_diagram_html(config: dict[str, Any]) -> str:
                 Optimization (Manager)
             </div>
             <div style="font-size:11px;color:{_VSM_COLORS['s3']['text']};">
-                Reporting: {s3_rhythm}
+                Reporting: {{s3_rhythm}}
             </div>
             <div style="font-size:11px;color:{_VSM_COLORS['s3']['text']};">
-                Resources: {s3_alloc[:60]}
+                Resources: {{s3_alloc}}
             </div>
         </div>
 
@@ -197,142 +165,195 @@ def vsm_diagram_html(config: dict[str, Any]) -> str:
                 border-radius:4px;background:{_VSM_COLORS['s1']['badge']};color:#fff;
                 margin-bottom:6px;letter-spacing:0.5px;">S1</span>
             <div style="font-size:14px;font-weight:700;color:#f8fafc;margin-bottom:8px;">
-                Operations — {len(s1_units)} unit{'s' if len(s1_units) != 1 else ''}
+                Operations — {{unit_count}} unit{{unit_plural}}
             </div>
-            {unit_html}
+            {{unit_html}}
         </div>
 
         <!-- S2: Coordination — bottom -->
         <div style="background: {_VSM_COLORS['s2']['bg']};
             border: 2px solid {_VSM_COLORS['s2']['border']};
             border-radius: 10px; padding: 14px; grid-column: 1 / 3; grid-row: 4;
-            opacity: {_opacity(has_s2)};">
+            opacity: {{s2_opacity}};">
             <span style="display:inline-block;font-size:10px;font-weight:700;padding:2px 8px;
                 border-radius:4px;background:{_VSM_COLORS['s2']['badge']};color:#fff;
                 margin-bottom:6px;letter-spacing:0.5px;">S2</span>
             <div style="font-size:14px;font-weight:700;color:#d1fae5;margin-bottom:6px;">
                 Coordination
             </div>
-            {rules_html}
+            {{rules_html}}
         </div>
     </div>
     """
 
 
-def budget_donut(allocations: list[dict[str, Any]], total: float) -> go.Figure:
-    """Donut chart showing budget allocation by system."""
-    labels = [a["system"] for a in allocations]
-    values = [a["monthly_usd"] for a in allocations]
-
-    colors_cycle = [
-        VIABLEOS_COLORS["primary"],
-        VIABLEOS_COLORS["secondary"],
-        VIABLEOS_COLORS["accent"],
-        VIABLEOS_COLORS["success"],
-        VIABLEOS_COLORS["warning"],
-        "#ec4899",
-        "#8b5cf6",
-        "#14b8a6",
-    ]
-
-    fig = go.Figure(
-        data=[
-            go.Pie(
-                labels=labels,
-                values=values,
-                hole=0.6,
-                marker=dict(colors=colors_cycle[: len(labels)]),
-                textinfo="label+percent",
-                textfont=dict(color="white", size=11),
-                hovertemplate="<b>%{label}</b><br>$%{value:.0f}/mo<br>%{percent}<extra></extra>",
-            )
-        ]
-    )
+_OPACITY = {True: "1.0", False: "0.5"}
 
-    fig.update_layout(
-        annotations=[
-            dict(
-                text=f"${total:.0f}<br><span style='font-size:11px'>/ month</span>",
-                x=0.5,
-                y=0.5,
-                font=dict(size=22, color="white"),
-                showarrow=False,
-            )
-        ],
-        showlegend=False,
-        paper_bgcolor="rgba(0,0,0,0)",
-        plot_bgcolor="rgba(0,0,0,0)",
-        margin=dict(t=20, b=20, l=20, r=20),
-        height=280,
-    )
-    return fig
 
+def vsm_diagram_html(config: dict[str, Any]) -> str:
+    """Generate an HTML VSM diagram matching the reference layout."""
+    vs = config.get("viable_system", {})
+    identity = vs.get("identity", {})
+    s1_units = vs.get("system_1", [])
+    s2_rules = vs.get("system_2", {}).get("coordination_rules", [])
+    s3_cfg = vs.get("system_3", {})
+    s3star_cfg = vs.get("system_3_star", {})
+    s4_cfg = vs.get("system_4", {})
+    hitl = vs.get("human_in_the_loop", {})
 
-def model_tier_bar(routing: dict[str, str]) -> go.Figure:
-    """Horizontal bar chart showing which model each system uses."""
-    tier_order = {"haiku": 1, "mini": 1.5, "sonnet": 2, "gpt-4o": 2.5, "opus": 3, "o3": 3}
-    tier_colors = {1: VIABLEOS_COLORS["success"], 1.5: VIABLEOS_COLORS["success"],
-                   2: VIABLEOS_COLORS["warning"], 2.5: VIABLEOS_COLORS["warning"],
-                   3: VIABLEOS_COLORS["danger"]}
-
-    labels = []
-    scores = []
-    colors = []
-    model_names = []
-
-    friendly = {
-        "s1_routine": "S1 Routine",
-        "s1_complex": "S1 Complex",
-        "s2_coordination": "S2 Coordinator",
-        "s3_optimization": "S3 Optimizer",
-        "s3_star_audit": "S3* Auditor",
-        "s4_intelligence": "S4 Scout",
-        "s5_preparation": "S5 Guardian",
+    has_s2 = bool(s2_rules)
+    has_s3 = bool(s3_cfg.get("reporting_rhythm") or s3_cfg.get("resource_allocation"))
+    has_s3star = bool(s3star_cfg.get("checks"))
+    has_s4 = bool(s4_cfg.get("monitoring"))
+
+    monitoring = s4_cfg.get("monitoring", {})
+    s4_items = monitoring.get("competitors", [])[:2] + monitoring.get("technology", [])[:2]
+
+    unit_html = _UNITS_TMPL.render(units=s1_units)
+    rules_html = _RULES_TMPL.render(rules=s2_rules)
+    checks_html = _CHECKS_TMPL.render(checks=s3star_cfg.get("checks", []))
+    s4_html = _S4_ITEMS_TMPL.render(items=s4_items)
+
+    # S5 info
+    values = identity.get("values", [])
+    never_do = identity.get("never_do", [])
+
+    return _VSM_SHELL.format_map({
+        "purpose": escape(identity.get("purpose", "—")[:80]),
+        "values_html": escape(", ".join(values[:3])) if values else "—",
+        "never_do_html": _NEVER_DO_TMPL.format(count=len(never_do)) if never_do else "",
+        # HiTL summary for S5 box
+        "approval_count": len(hitl.get("approval_required", [])),
+        "emergency_count": len(hitl.get("emergency_alerts", [])),
+        "s4_opacity": _OPACITY[has_s4],
+        "s4_html": s4_html or _NOT_CONFIGURED_HTML,
+        "s3star_opacity": _OPACITY[has_s3star],
+        "checks_html": checks_html or _NOT_CONFIGURED_HTML,
+        "s3_opacity": _OPACITY[has_s3],
+        "s3_rhythm": escape(s3_cfg.get("reporting_rhythm", "—")),
+        "s3_alloc": escape(s3_cfg.get("resource_allocation", "—")[:60]),
+        "unit_count": len(s1_units),
+        "unit_plural": "s" if len(s1_units) != 1 else "",
+        "unit_html": unit_html,
+        "s2_opacity": _OPACITY[has_s2],
+        "rules_html": rules_html or _NOT_CONFIGURED_HTML,
+    })
+
+
+# Plotly specs are assembled as plain dicts around module-level layouts:
+# only labels/values/colors vary per call, so there is no update_layout merge.
+# go.Figure still validates the spec. Skipping that needs the private
+# ``_validate`` kwarg, and the figures are built once per input anyway and
+# then cached with st.cache_resource by the dashboard.
+_DONUT_COLORS = (
+    VIABLEOS_COLORS["primary"],
+    VIABLEOS_COLORS["secondary"],
+    VIABLEOS_COLORS["accent"],
+    VIABLEOS_COLORS["success"],
+    VIABLEOS_COLORS["warning"],
+    "#ec4899",
+    "#8b5cf6",
+    "#14b8a6",
+)
+
+_DONUT_LAYOUT: dict[str, Any] = {
+    "showlegend": False,
+    "paper_bgcolor": "rgba(0,0,0,0)",
+    "plot_bgcolor": "rgba(0,0,0,0)",
+    "margin": {"t": 20, "b": 20, "l": 20, "r": 20},
+    "height": 280,
+}
+
+_BAR_LAYOUT: dict[str, Any] = {
+    "xaxis": {
+        "showgrid": False,
+        "showticklabels": False,
+        "range": [0, 3.5],
+    },
+    "yaxis": {
+        "autorange": "reversed",
+        "tickfont": {"color": "#94a3b8", "size": 11},
+    },
+    "paper_bgcolor": "rgba(0,0,0,0)",
+    "plot_bgcolor": "rgba(0,0,0,0)",
+    "margin": {"t": 10, "b": 10, "l": 100, "r": 20},
+    "height": 240,
+}
+
+_TIER_ORDER = {"haiku": 1, "mini": 1.5, "sonnet": 2, "gpt-4o": 2.5, "opus": 3, "o3": 3}
+_TIER_COLORS = {
+    1: VIABLEOS_COLORS["success"], 1.5: VIABLEOS_COLORS["success"],
+    2: VIABLEOS_COLORS["warning"], 2.5: VIABLEOS_COLORS["warning"],
+    3: VIABLEOS_COLORS["danger"],
+}
+
+_ROUTING_LABELS = {
+    "s1_routine": "S1 Routine",
+    "s1_complex": "S1 Complex",
+    "s2_coordination": "S2 Coordinator",
+    "s3_optimization": "S3 Optimizer",
+    "s3_star_audit": "S3* Auditor",
+    "s4_intelligence": "S4 Scout",
+    "s5_preparation": "S5 Guardian",
+}
+
+
+def budget_donut(labels: Sequence[str], values: Sequence[float], total: float) -> go.Figure:
+    """Donut chart showing budget allocation by system (parallel labels/values)."""
+    pie = {
+        "type": "pie",
+        "labels": list(labels),
+        "values": list(values),
+        "hole": 0.6,
+        "marker": {"colors": list(_DONUT_COLORS[: len(labels)])},
+        "textinfo": "label+percent",
+        "textfont": {"color": "white", "size": 11},
+        "hovertemplate": "<b>%{label}</b><br>$%{value:.0f}/mo<br>%{percent}<extra></extra>",
+    }
+    center_label = {
+        "text": f"${total:.0f}<br><span style='font-size:11px'>/ month</span>",
+        "x": 0.5,
+        "y": 0.5,
+        "font": {"size": 22, "color": "white"},
+        "showarrow": False,
     }
+    return go.Figure({"data": [pie], "layout": {**_DONUT_LAYOUT, "annotations": [center_label]}})
 
-    for key in ["s1_routine", "s1_complex", "s2_coordination", "s3_optimization",
-                "s3_star_audit", "s4_intelligence", "s5_preparation"]:
-        model = routing.get(key, "unknown")
-        model_short = model.split("/")[-1] if "/" in model else model
-        tier = 2
-        for kw, score in tier_order.items():
-            if kw in model.lower():
-                tier = score
-                break
-
-        labels.append(friendly.get(key, key))
-        scores.append(tier)
-        colors.append(tier_colors.get(tier, VIABLEOS_COLORS["muted"]))
-        model_names.append(model_short)
-
-    fig = go.Figure(
-        data=[
-            go.Bar(
-                y=labels,
-                x=scores,
-                orientation="h",
-                marker=dict(color=colors),
-                text=model_names,
-                textposition="inside",
-                textfont=dict(color="white", size=11),
-                hovertemplate="<b>%{y}</b><br>%{text}<extra></extra>",
-            )
-        ]
-    )
 
-    fig.update_layout(
-        xaxis=dict(
-            showgrid=False,
-            showticklabels=False,
-            range=[0, 3.5],
-        ),
-        yaxis=dict(
-            autorange="reversed",
-            tickfont=dict(color="#94a3b8", size=11),
-        ),
-        paper_bgcolor="rgba(0,0,0,0)",
-        plot_bgcolor="rgba(0,0,0,0)",
-        margin=dict(t=10, b=10, l=100, r=20),
-        height=240,
+@functools.lru_cache(maxsize=128)
+def _classify_model(model: str) -> tuple[float, str, str]:
+    """(tier, bar color, short name) for a model id."""
+    lowered = model.lower()
+    tier = 2
+    for kw, score in _TIER_ORDER.items():
+        if kw in lowered:
+            tier = score
+            break
+    short = model.split("/")[-1] if "/" in model else model
+    return tier, _TIER_COLORS.get(tier, VIABLEOS_COLORS["muted"]), short
+
+
+@functools.lru_cache(maxsize=64)
+def _tier_rows(models: tuple[str, ...]) -> tuple[list[str], list[float], list[str], list[str]]:
+    """Bar rows for the models routed to each ``_ROUTING_LABELS`` key, in order."""
+    tiers, colors, short_names = zip(*map(_classify_model, models))
+    return list(_ROUTING_LABELS.values()), list(tiers), list(colors), list(short_names)
+
+
+def model_tier_bar(routing: dict[str, str]) -> go.Figure:
+    """Horizontal bar chart showing which model each system uses."""
+    labels, scores, colors, model_names = _tier_rows(
+        tuple(routing.get(key, "unknown") for key in _ROUTING_LABELS)
     )
-    return fig
+    bar = {
+        "type": "bar",
+        "y": labels,
+        "x": scores,
+        "orientation": "h",
+        "marker": {"color": colors},
+        "text": model_names,
+        "textposition": "inside",
+        "textfont": {"color": "white", "size": 11},
+        "hovertemplate": "<b>%{y}</b><br>%{text}<extra></extra>",
+    }
+    return go.Figure({"data": [bar], "layout": _BAR_LAYOUT})
@@ -2,10 +2,24 @@
 
 from __future__ import annotations
 
+from pathlib import Path
 from typing import Any
 
 import streamlit as st
 
+from viableos.app.state import parse_csv
+
+# Loaded once per process; this module is imported once, while main.py re-runs.
+_THEME_STYLE = f"<style>\n{(Path(__file__).parent / 'theme.css').read_text()}</style>"
+
+
+def inject_theme() -> None:
+    """Apply the dark theme CSS.
+
+    Called on every run: Streamlit removes elements a rerun does not emit again.
+    """
+    st.markdown(_THEME_STYLE, unsafe_allow_html=True)
+
 
 def step_header(step: int, total: int, title: str, subtitle: str = "") -> None:
     """Render a wizard step header with progress bar."""
@@ -119,7 +133,7 @@ def unit_editor(unit: dict[str, Any], index: int, autonomy_options: dict[str, st
             key=f"unit_tools_extra_{index}",
             placeholder="e.g. custom-api, internal-tool",
         )
-        extra_tools = [t.strip() for t in extra_tools_str.split(",") if t.strip()] if extra_tools_str else []
+        extra_tools = parse_csv(extra_tools_str)
 
         final_autonomy = autonomy_custom if autonomy_custom else autonomy_options.get(selected_autonomy, "")
         all_tools = selected_tools + [t for t in extra_tools if t not in selected_tools]
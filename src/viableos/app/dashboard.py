@@ -2,20 +2,82 @@
 
 from __future__ import annotations
 
+import atexit
+import hashlib
+import os
+import shutil
 import tempfile
+import threading
+from collections import OrderedDict
 from pathlib import Path
 
+import orjson
+import plotly.graph_objects as go
 import streamlit as st
 import streamlit.components.v1 as components
 import yaml
+from jinja2 import Environment
+from markupsafe import escape
 
 from viableos.app.charts import budget_donut, model_tier_bar, vsm_diagram_html
 from viableos.app.state import get_config, get_vs
-from viableos.budget import FRIENDLY_NAMES, calculate_budget
-from viableos.checker import check_viability
+from viableos.budget import FRIENDLY_NAMES, BudgetPlan, calculate_budget
+from viableos.checker import ViabilityReport, check_viability
+from viableos.checker import Warning as ViabilityWarning
 from viableos.generator import generate_openclaw_package
 from viableos.schema import validate
 
+try:
+    from yaml import CSafeDumper as _YamlDumper
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeDumper as _YamlDumper
+
+
+# Chart builders are cached across reruns. Figures go through cache_resource
+# rather than cache_data: unpickling a go.Figure re-runs Plotly's validators,
+# which is the cost being avoided. st.plotly_chart only reads the figure.
+@st.cache_resource(show_spinner=False, max_entries=32)
+def _budget_donut(labels: tuple[str, ...], values: tuple[float, ...], total: float) -> go.Figure:
+    return budget_donut(labels, values, total)
+
+
+@st.cache_resource(show_spinner=False, max_entries=32)
+def _model_tier_bar(routing: tuple[tuple[str, str], ...]) -> go.Figure:
+    return model_tier_bar(dict(routing))
+
+
+def _config_key(config: dict) -> str:
+    """Content hash of a config, computed once per rerun.
+
+    Config-derived caches below take this key plus the config as ``_cfg``,
+    which Streamlit's (pure-Python, recursive) arg hasher then skips.
+    """
+    body = orjson.dumps(config, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS)
+    return hashlib.blake2b(body, digest_size=16).hexdigest()
+
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def _vsm_diagram_html(cfg_key: str, _cfg: dict) -> str:
+    return vsm_diagram_html(_cfg)
+
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def _dump_yaml(cfg_key: str, _cfg: dict) -> str:
+    return yaml.dump(
+        _cfg, Dumper=_YamlDumper, default_flow_style=False, allow_unicode=True, sort_keys=False
+    )
+
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def _analyze(
+    cfg_key: str, _cfg: dict
+) -> tuple[list[str], BudgetPlan | None, ViabilityReport | None]:
+    """Validate, budget and check a config once per distinct config."""
+    errors = validate(_cfg)
+    if errors:
+        return errors, None, None
+    return errors, calculate_budget(_cfg), check_viability(_cfg)
+
 
 def render_dashboard() -> None:
     """Main dashboard renderer."""
@@ -43,57 +105,99 @@ def render_dashboard() -> None:
             st.rerun()
 
     # Validation
-    errors = validate(config)
+    cfg_key = _config_key(config)
+    errors, plan, report = _analyze(cfg_key, config)
     if errors:
         st.error(f"Configuration has {len(errors)} validation errors")
         for err in errors:
             st.markdown(f"- {err}")
         return
 
-    plan = calculate_budget(config)
-    report = check_viability(config)
-
-    # Top metrics
-    m1, m2, m3, m4, m5 = st.columns(5)
-    with m1:
-        st.metric("Viability Score", f"{report.score}/{report.total}")
-    with m2:
-        st.metric("Monthly Budget", f"${plan.total_monthly_usd:.0f}")
-    with m3:
-        st.metric("Strategy", plan.strategy.title())
-    with m4:
-        st.metric("Agents", str(len(plan.allocations)))
-    with m5:
-        critical_count = sum(1 for w in report.warnings if w.severity == "critical")
-        warning_count = sum(1 for w in report.warnings if w.severity == "warning")
-        st.metric("Warnings", f"{critical_count}C / {warning_count}W")
-
+    critical, other, warning_count = _partition_warnings(report)
+    _render_metrics(plan, report, len(critical), warning_count)
     st.divider()
-
-    # ── Warnings panel ────────────────────────────────────────────────────
-    if report.warnings:
-        critical = [w for w in report.warnings if w.severity == "critical"]
-        other = [w for w in report.warnings if w.severity != "critical"]
-
+    _render_warnings(critical, other)
+    _render_charts(plan, cfg_key, config)
+    st.divider()
+    _render_checklist(report)
+    st.divider()
+    _render_agents(vs, plan)
+    st.divider()
+    _render_policies(vs)
+    st.divider()
+    _render_export(cfg_key, config)
+
+
+def _partition_warnings(
+    report: ViabilityReport,
+) -> tuple[list[ViabilityWarning], list[ViabilityWarning], int]:
+    """Split warnings into (critical, other) and count the "warning" severity, in one pass."""
+    critical: list[ViabilityWarning] = []
+    other: list[ViabilityWarning] = []
+    warning_count = 0
+    for w in report.warnings:
+        if w.severity == "critical":
+            critical.append(w)
+        else:
+            other.append(w)
+            if w.severity == "warning":
+                warning_count += 1
+    return critical, other, warning_count
+
+
+# The metrics row and the checklist are single CSS-grid markdown elements
+# rather than st.columns of st.metric / st.markdown children.
+_METRICS_GRID = (
+    '<div style="display:grid;grid-template-columns:repeat(5,1fr);gap:12px;margin-bottom:8px;">'
+    "{tiles}</div>"
+)
+
+_METRIC_TILE = (
+    '<div><div style="font-size:14px;color:#94a3b8;">{label}</div>'
+    '<div style="font-size:2.25rem;line-height:1.3;color:#f8fafc;">{value}</div></div>'
+)
+
+
+def _render_metrics(
+    plan: BudgetPlan, report: ViabilityReport, critical_count: int, warning_count: int
+) -> None:
+    metrics = (
+        ("Viability Score", f"{report.score}/{report.total}"),
+        ("Monthly Budget", f"${plan.total_monthly_usd:.0f}"),
+        ("Strategy", escape(plan.strategy.title())),
+        ("Agents", str(len(plan.allocations))),
+        ("Warnings", f"{critical_count}C / {warning_count}W"),
+    )
+    tiles = "".join(_METRIC_TILE.format(label=label, value=value) for label, value in metrics)
+    st.markdown(_METRICS_GRID.format(tiles=tiles), unsafe_allow_html=True)
+
+
+_SEVERITY_COLORS = {"warning": "#f59e0b", "info": "#6366f1"}
+
+
+def _render_warnings(critical: list[ViabilityWarning], other: list[ViabilityWarning]) -> None:
+    if critical or other:
         if critical:
-            for w in critical:
-                st.markdown(
+            st.markdown(
+                "".join(
                     f"""<div style="padding:10px 14px;border-radius:8px;border-left:4px solid #ef4444;
                     background:#1e293b;margin-bottom:6px;">
                     <span style="color:#ef4444;font-weight:700;font-size:10px;">CRITICAL</span>
                     <span style="color:#94a3b8;font-size:10px;margin-left:8px;">{w.category}</span>
                     <div style="color:#f8fafc;font-size:12px;margin-top:2px;">{w.message}</div>
                     <div style="color:#94a3b8;font-size:11px;">{w.suggestion}</div>
-                    </div>""",
-                    unsafe_allow_html=True,
-                )
+                    </div>"""
+                    for w in critical
+                ),
+                unsafe_allow_html=True,
+            )
 
         if other:
             with st.expander(f"Warnings and insights ({len(other)})", expanded=False):
-                severity_colors = {"warning": "#f59e0b", "info": "#6366f1"}
+                parts = []
                 for w in other:
-                    color = severity_colors.get(w.severity, "#64748b")
-                    st.markdown(
+                    color = _SEVERITY_COLORS.get(w.severity, "#64748b")
+                    parts.append(
                         f"""<div style="padding:8px 12px;border-radius:6px;border-left:3px solid {color};
                         background:#1e293b;margin-bottom:4px;">
                         <span style="color:{color};font-weight:700;font-size:10px;text-transform:uppercase;">
@@ -102,64 +206,98 @@ def render_dashboard() -> None:
                         <span style="color:#94a3b8;font-size:10px;margin-left:6px;">{w.category}</span>
                         <div style="color:#f8fafc;font-size:12px;margin-top:2px;">{w.message}</div>
                         <div style="color:#94a3b8;font-size:11px;">{w.suggestion}</div>
-                        </div>""",
-                        unsafe_allow_html=True,
+                        </div>"""
                     )
+                st.markdown("".join(parts), unsafe_allow_html=True)
 
         st.divider()
 
+
+def _render_charts(plan: BudgetPlan, cfg_key: str, config: dict) -> None:
     # Two-column layout: VSM diagram | Budget + Models
     left, right = st.columns([1.3, 1])
 
     with left:
         st.markdown("### System Map")
-        diagram = vsm_diagram_html(config)
+        diagram = _vsm_diagram_html(cfg_key, config)
         components.html(diagram, height=700, scrolling=True)
 
     with right:
         st.markdown("### Budget Allocation")
-        alloc_dicts = [
-            {"system": a.system, "monthly_usd": a.monthly_usd, "model": a.model, "percentage": a.percentage}
-            for a in plan.allocations
-        ]
-        fig = budget_donut(alloc_dicts, plan.total_monthly_usd)
-        st.plotly_chart(fig, use_container_width=True, config={"displayModeBar": False})
+        labels = tuple(a.system for a in plan.allocations)
+        values = tuple(a.monthly_usd for a in plan.allocations)
+        fig = _budget_donut(labels, values, plan.total_monthly_usd)
+        st.plotly_chart(
+            fig, use_container_width=True, theme=None, key="dash_budget_donut",
+            config={"displayModeBar": False},
+        )
 
         st.markdown("### Model Routing")
-        fig = model_tier_bar(plan.model_routing)
-        st.plotly_chart(fig, use_container_width=True, config={"displayModeBar": False})
+        fig = _model_tier_bar(tuple(plan.model_routing.items()))
+        st.plotly_chart(
+            fig, use_container_width=True, theme=None, key="dash_model_tier_bar",
+            config={"displayModeBar": False},
+        )
 
-    st.divider()
 
+def _render_checklist(report: ViabilityReport) -> None:
     # Viability checklist
     st.markdown("### Viability Checklist")
-    check_cols = st.columns(3)
-    for i, check in enumerate(report.checks):
-        with check_cols[i % 3]:
-            status = "PASS" if check.present else "MISSING"
-            color = "#10b981" if check.present else "#ef4444"
-            st.markdown(
-                f"""<div style="padding:8px 12px;border-radius:8px;border:1px solid #334155;
-                background:#1e293b;margin-bottom:8px;">
-                <span style="color:{color};font-weight:700;font-size:11px;">{status}</span>
-                <span style="color:#f8fafc;font-weight:600;margin-left:6px;">{check.system} {check.name}</span>
-                <div style="font-size:11px;color:#94a3b8;margin-top:2px;">{check.details}</div>
-                </div>""",
-                unsafe_allow_html=True,
-            )
+    cards = []
+    for check in report.checks:
+        status = "PASS" if check.present else "MISSING"
+        color = "#10b981" if check.present else "#ef4444"
+        cards.append(
+            f"""<div style="padding:8px 12px;border-radius:8px;border:1px solid #334155;
+            background:#1e293b;">
+            <span style="color:{color};font-weight:700;font-size:11px;">{status}</span>
+            <span style="color:#f8fafc;font-weight:600;margin-left:6px;">{check.system} {check.name}</span>
+            <div style="font-size:11px;color:#94a3b8;margin-top:2px;">{check.details}</div>
+            </div>"""
+        )
+    st.markdown(
+        '<div style="display:grid;grid-template-columns:repeat(3,1fr);gap:8px 16px;">'
+        + "".join(cards)
+        + "</div>",
+        unsafe_allow_html=True,
+    )
+
+
+_MANAGEMENT_AGENTS = (
+    ("Coordinator", "S2", "s2_coordination", "Prevents conflicts between units"),
+    ("Optimizer", "S3", "s3_optimization", "Allocates resources, weekly digest"),
+    ("Auditor", "S3*", "s3_star_audit", "Independent quality verification"),
+    ("Scout", "S4", "s4_intelligence", "Monitors environment, strategic briefs"),
+    ("Policy Guardian", "S5", "s5_preparation", "Enforces values and policies"),
+)
+
+# Compiled once; autoescaping keeps config-supplied names and purposes inert.
+_AGENT_CARDS_TMPL = Environment(autoescape=True).from_string(
+    """<div style="display:grid;grid-template-columns:1fr 1fr 1fr;gap:10px;"""
+    """font-family:-apple-system,BlinkMacSystemFont,'Segoe UI',sans-serif;">"""
+    """{% for a in agents %}<div style="padding:12px;border-radius:8px;border:1px solid #334155;background:#1e293b;">
+            <div style="font-weight:700;color:#f8fafc;font-size:14px;">{{ a.name }}</div>
+            <div style="font-size:10px;color:#64748b;margin-bottom:4px;">{{ a.role }}</div>
+            <div style="font-size:12px;color:#cbd5e1;margin-bottom:4px;">{{ a.purpose }}</div>
+            <div style="font-size:10px;color:#475569;margin-top:4px;">
+                Model: <span style="color:#94a3b8;font-family:monospace;background:#0f172a;padding:1px 5px;border-radius:3px;">{{ a.model.split("/")[-1] }}</span>
+                &nbsp;|&nbsp; {{ a.budget }}/mo
+            </div>
+            {% if a.tools %}<div style="font-size:10px;color:#475569;margin-top:2px;">Tools: {{ a.tools }}</div>{% endif %}
+        </div>{% endfor %}</div>"""
+)
 
-    st.divider()
 
+def _render_agents(vs: dict, plan: BudgetPlan) -> None:
     # Agent cards
     st.markdown("### Agent Overview")
 
+    # Reversed so duplicate unit names keep resolving to the first allocation.
+    alloc_by_system = {a.system: a for a in reversed(plan.allocations)}
     s1_units = vs.get("system_1", [])
     agent_data = []
     for unit in s1_units:
-        alloc = next(
-            (a for a in plan.allocations if a.system == f"S1:{unit.get('name', '?')}"),
-            None,
-        )
+        alloc = alloc_by_system.get(f"S1:{unit.get('name', '?')}")
         agent_data.append({
             "name": unit.get("name", "?"),
             "role": "Operations (S1)",
@@ -170,15 +308,8 @@ def render_dashboard() -> None:
             "tools": ", ".join(unit.get("tools", [])[:4]),
         })
 
-    management_agents = [
-        ("Coordinator", "S2", "s2_coordination", "Prevents conflicts between units"),
-        ("Optimizer", "S3", "s3_optimization", "Allocates resources, weekly digest"),
-        ("Auditor", "S3*", "s3_star_audit", "Independent quality verification"),
-        ("Scout", "S4", "s4_intelligence", "Monitors environment, strategic briefs"),
-        ("Policy Guardian", "S5", "s5_preparation", "Enforces values and policies"),
-    ]
-    for mgmt_name, sys_key, routing_key, purpose in management_agents:
-        alloc = next((a for a in plan.allocations if a.system == sys_key), None)
+    for mgmt_name, sys_key, routing_key, purpose in _MANAGEMENT_AGENTS:
+        alloc = alloc_by_system.get(sys_key)
         agent_data.append({
             "name": mgmt_name,
             "role": f"{FRIENDLY_NAMES.get(sys_key, sys_key)} ({sys_key})",
@@ -189,28 +320,14 @@ def render_dashboard() -> None:
             "tools": "",
         })
 
-    cards_html = '<div style="display:grid;grid-template-columns:1fr 1fr 1fr;gap:10px;font-family:-apple-system,BlinkMacSystemFont,\'Segoe UI\',sans-serif;">'
-    for agent in agent_data:
-        model_short = agent["model"].split("/")[-1] if "/" in agent["model"] else agent["model"]
-        tools_line = f'<div style="font-size:10px;color:#475569;margin-top:2px;">Tools: {agent["tools"]}</div>' if agent["tools"] else ""
-        cards_html += f'''<div style="padding:12px;border-radius:8px;border:1px solid #334155;background:#1e293b;">
-            <div style="font-weight:700;color:#f8fafc;font-size:14px;">{agent["name"]}</div>
-            <div style="font-size:10px;color:#64748b;margin-bottom:4px;">{agent["role"]}</div>
-            <div style="font-size:12px;color:#cbd5e1;margin-bottom:4px;">{agent["purpose"]}</div>
-            <div style="font-size:10px;color:#475569;margin-top:4px;">
-                Model: <span style="color:#94a3b8;font-family:monospace;background:#0f172a;padding:1px 5px;border-radius:3px;">{model_short}</span>
-                &nbsp;|&nbsp; {agent["budget"]}/mo
-            </div>
-            {tools_line}
-        </div>'''
-    cards_html += '</div>'
+    cards_html = _AGENT_CARDS_TMPL.render(agents=agent_data)
 
     row_count = (len(agent_data) + 2) // 3
     cards_height = row_count * 140 + 20
     components.html(cards_html, height=cards_height, scrolling=False)
 
-    st.divider()
 
+def _render_policies(vs: dict) -> None:
     # HiTL summary
     hitl = vs.get("human_in_the_loop", {})
     if hitl:
@@ -236,12 +353,14 @@ def render_dashboard() -> None:
     if never_do:
         st.divider()
         st.markdown("### Agent Boundaries (NEVER DO)")
-        for item in never_do:
-            st.markdown(
+        st.markdown(
+            "".join(
                 f"<div style='padding:4px 10px;font-size:12px;color:#fca5a5;'>"
-                f"<span style='color:#ef4444;font-weight:700;'>X</span> {item}</div>",
-                unsafe_allow_html=True,
-            )
+                f"<span style='color:#ef4444;font-weight:700;'>X</span> {item}</div>"
+                for item in never_do
+            ),
+            unsafe_allow_html=True,
+        )
 
     # Persistence
     persistence = vs.get("persistence", {})
@@ -252,18 +371,130 @@ def render_dashboard() -> None:
         if persistence.get("path"):
             st.markdown(f"Path: `{persistence['path']}`")
 
-    st.divider()
 
+# Top-level package files previewed after the per-workspace markdown: label, language.
+_PACKAGE_TOP_FILES = {
+    "openclaw.json": ("openclaw.json (with fallbacks + agent-to-agent)", "json"),
+    "install.sh": ("install.sh (phased rollout)", "bash"),
+}
+
+
+def _package_files(out_path: Path) -> dict[str, tuple[Path, str]]:
+    """Previewable files of a generated package, in display order: label -> (path, language).
+
+    Only lists paths; contents are read when a file is actually selected.
+    """
+    files: dict[str, tuple[Path, str]] = {}
+    with os.scandir(out_path / "workspaces") as it:
+        workspaces = sorted(it, key=lambda e: e.name)
+    for ws in workspaces:
+        for ft in ("SOUL.md", "SKILL.md", "HEARTBEAT.md"):
+            fpath = os.path.join(ws.path, ft)
+            if os.path.isfile(fpath):
+                files[f"{ws.name}/{ft}"] = (Path(fpath), "markdown")
+    for shared_file in ("coordination_rules.md", "org_memory.md"):
+        spath = out_path / "shared" / shared_file
+        if spath.exists():
+            files[f"shared/{shared_file}"] = (spath, "markdown")
+    for name, (label, language) in _PACKAGE_TOP_FILES.items():
+        files[label] = (out_path / name, language)
+    return files
+
+
+# Generated packages live in temp dirs keyed by config; only the most recently
+# used ones are kept, so a long-running server does not fill the disk.
+_MAX_PACKAGES = 16
+_PACKAGES: OrderedDict[str, Path] = OrderedDict()
+_PACKAGES_LOCK = threading.Lock()
+
+
+@atexit.register
+def _remove_package_dirs() -> None:
+    with _PACKAGES_LOCK:
+        while _PACKAGES:
+            shutil.rmtree(_PACKAGES.popitem()[1].parent, ignore_errors=True)
+
+
+def _cached_package(cfg_key: str) -> Path | None:
+    with _PACKAGES_LOCK:
+        out_path = _PACKAGES.get(cfg_key)
+        if out_path is not None:
+            _PACKAGES.move_to_end(cfg_key)
+        return out_path
+
+
+def _build_package(cfg_key: str, config: dict) -> Path:
+    """Generate the OpenClaw package for a config once and keep it on disk.
+
+    Keeps the last ``_MAX_PACKAGES`` packages; the least recently used
+    directory is removed whenever a new one pushes it out. Generation runs
+    outside the lock so other sessions' lookups never wait on it.
+    """
+    out_path = _cached_package(cfg_key)
+    if out_path is not None:
+        return out_path
+
+    tmp = tempfile.mkdtemp(prefix="viableos_pkg_")
+    try:
+        out_path = generate_openclaw_package(config, Path(tmp) / "viableos-openclaw")
+    except BaseException:
+        shutil.rmtree(tmp, ignore_errors=True)
+        raise
+
+    stale: list[Path] = []
+    with _PACKAGES_LOCK:
+        existing = _PACKAGES.get(cfg_key)
+        if existing is not None:
+            # Another session generated the same config in the meantime.
+            _PACKAGES.move_to_end(cfg_key)
+            stale.append(out_path.parent)
+            out_path = existing
+        else:
+            _PACKAGES[cfg_key] = out_path
+            while len(_PACKAGES) > _MAX_PACKAGES:
+                stale.append(_PACKAGES.popitem(last=False)[1].parent)
+    for old in stale:
+        shutil.rmtree(old, ignore_errors=True)
+    return out_path
+
+
+def _render_package(out_path: Path) -> None:
+    with os.scandir(out_path / "workspaces") as entries:
+        agent_count = sum(
+            1 for e in entries if e.is_dir() and os.path.isfile(os.path.join(e.path, "SOUL.md"))
+        )
+    st.success(
+        f"Generated {agent_count} agents — each with "
+        f"SOUL.md, SKILL.md, HEARTBEAT.md, USER.md, MEMORY.md, AGENTS.md"
+    )
+
+    # One file at a time: only the selected file is read and sent to the browser.
+    files = _package_files(out_path)
+    choice = st.selectbox("Preview file", list(files), key="package_preview")
+    fpath, language = files[choice]
+    st.code(fpath.read_text(), language=language)
+
+    st.download_button(
+        "Download openclaw.json",
+        data=(out_path / "openclaw.json").read_bytes(),
+        file_name="openclaw.json",
+        mime="application/json",
+    )
+
+
+# The export controls run as a fragment: pressing "Generate" or downloading
+# only reruns this block, not the metrics, charts and cards above it.
+@st.fragment
+def _render_export(cfg_key: str, config: dict) -> None:
     # Export
     st.markdown("### Export")
 
     col_yaml, col_generate = st.columns(2)
 
     with col_yaml:
-        yaml_str = yaml.dump(config, default_flow_style=False, allow_unicode=True, sort_keys=False)
         st.download_button(
             "Download YAML Config",
-            data=yaml_str,
+            data=_dump_yaml(cfg_key, config),
             file_name="viableos.yaml",
             mime="text/yaml",
             use_container_width=True,
@@ -272,40 +503,15 @@ def render_dashboard() -> None:
     with col_generate:
         if st.button("Generate OpenClaw Package", use_container_width=True, type="primary"):
             with st.spinner("Generating..."):
-                with tempfile.TemporaryDirectory() as tmp:
-                    out_path = generate_openclaw_package(config, Path(tmp) / "viableos-openclaw")
-                    agent_count = len(list(out_path.glob("workspaces/*/SOUL.md")))
-
-                    file_types = ["SOUL.md", "SKILL.md", "HEARTBEAT.md"]
-                    st.success(
-                        f"Generated {agent_count} agents — each with "
-                        f"SOUL.md, SKILL.md, HEARTBEAT.md, USER.md, MEMORY.md, AGENTS.md"
-                    )
-
-                    for ws_dir in sorted((out_path / "workspaces").iterdir()):
-                        for ft in file_types:
-                            fpath = ws_dir / ft
-                            if fpath.exists():
-                                with st.expander(f"{ws_dir.name}/{ft}"):
-                                    st.code(fpath.read_text(), language="markdown")
-
-                    for shared_file in ["coordination_rules.md", "org_memory.md"]:
-                        spath = out_path / "shared" / shared_file
-                        if spath.exists():
-                            with st.expander(f"shared/{shared_file}"):
-                                st.code(spath.read_text(), language="markdown")
-
-                    openclaw_json = (out_path / "openclaw.json").read_text()
-                    with st.expander("openclaw.json (with fallbacks + agent-to-agent)"):
-                        st.code(openclaw_json, language="json")
-
-                    install_sh = (out_path / "install.sh").read_text()
-                    with st.expander("install.sh (phased rollout)"):
-                        st.code(install_sh, language="bash")
-
-                    st.download_button(
-                        "Download openclaw.json",
-                        data=openclaw_json,
-                        file_name="openclaw.json",
-                        mime="application/json",
-                    )
+                _build_package(cfg_key, config)
+                st.session_state["generated_key"] = cfg_key
+
+        # The package stays on disk so the preview survives reruns, but only
+        # while it still matches the config it was generated from and has not
+        # been evicted by newer packages.
+        if st.session_state.get("generated_key") == cfg_key:
+            out_path = _cached_package(cfg_key)
+            if out_path is None:
+                st.info("The generated package has expired. Generate it again to preview it.")
+            else:
+                _render_package(out_path)
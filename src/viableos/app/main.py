@@ -14,34 +14,10 @@ st.set_page_config(
     initial_sidebar_state="collapsed",
 )
 
-st.markdown(
-    """<style>
-    @import url('https://fonts.googleapis.com/css2?family=Inter:wght@400;500;600;700&display=swap');
-    .stApp { background-color: #0f172a; font-family: 'Inter', sans-serif; }
-    .stMetric label { color: #94a3b8 !important; }
-    .stMetric [data-testid="stMetricValue"] { color: #f8fafc !important; }
-    section[data-testid="stSidebar"] { background-color: #1e293b; }
-    .stSelectbox label, .stTextInput label, .stTextArea label,
-    .stRadio label, .stSlider label, .stNumberInput label,
-    .stMultiSelect label { color: #cbd5e1 !important; }
-    h1, h2, h3, h4, h5 { color: #f8fafc !important; }
-    p, li, span { color: #cbd5e1; }
-    .stDivider { border-color: #334155 !important; }
-    div[data-testid="stExpander"] { border-color: #334155 !important; }
-    .stButton > button[kind="primary"] {
-        background-color: #6366f1 !important;
-        color: white !important;
-        border: none !important;
-    }
-    .stButton > button[kind="primary"]:hover {
-        background-color: #4f46e5 !important;
-    }
-    .stProgress > div > div { background-color: #6366f1 !important; }
-    </style>""",
-    unsafe_allow_html=True,
-)
+from viableos.app.components import inject_theme  # noqa: E402
+
+inject_theme()
 
-from viableos.app.dashboard import render_dashboard  # noqa: E402
 from viableos.app.state import TEMPLATE_INFO, init_state, load_template, set_config  # noqa: E402
 from viableos.app.wizard import render_wizard  # noqa: E402
 
@@ -113,6 +89,9 @@ def main() -> None:
         st.divider()
         render_wizard()
     elif view == "dashboard":
+        # Imported here so wizard-only sessions never load the charts, Jinja or the generator.
+        from viableos.app.dashboard import render_dashboard
+
         render_dashboard()
 
 
@@ -2,11 +2,11 @@
 
 from __future__ import annotations
 
+import copy
 from pathlib import Path
 from typing import Any
 
 import streamlit as st
-import yaml
 
 TEMPLATES_DIR = Path(__file__).parent.parent / "templates"
 
@@ -197,7 +197,7 @@ def init_state() -> None:
         "wizard_step": 0,
         "config": {},
         "template_key": None,
-        "generated_path": None,
+        "generated_key": None,
         "view": "wizard",
     }
     for key, value in defaults.items():
@@ -205,13 +205,28 @@ def init_state() -> None:
             st.session_state[key] = value
 
 
-def load_template(template_key: str) -> dict[str, Any]:
-    """Load a YAML template file."""
+@st.cache_resource(show_spinner=False)
+def _parse_template(template_key: str) -> dict[str, Any]:
+    """Parse a template once per process. The result is shared: never mutate it."""
+    # PyYAML is imported on first use: a session that starts from scratch
+    # never loads a template. CSafeLoader is absent without libyaml.
+    import yaml
+
     path = TEMPLATES_DIR / f"{template_key}.yaml"
     if not path.exists():
         return {}
     with open(path) as f:
-        return yaml.safe_load(f)
+        return yaml.load(f, Loader=getattr(yaml, "CSafeLoader", yaml.SafeLoader))
+
+
+def load_template(template_key: str) -> dict[str, Any]:
+    """Load a YAML template file as a fresh config the caller may edit."""
+    return copy.deepcopy(_parse_template(template_key))
+
+
+def parse_csv(text: str) -> list[str]:
+    """Split comma-separated user input into stripped, non-empty items."""
+    return [t for t in (x.strip() for x in text.split(",")) if t] if text else []
 
 
 def get_config() -> dict[str, Any]:
@@ -227,3 +242,11 @@ def set_config(config: dict[str, Any]) -> None:
 def get_vs() -> dict[str, Any]:
     """Shortcut to get the viable_system section."""
     return get_config().get("viable_system", {})
+
+
+def edit_vs() -> dict[str, Any]:
+    """The live viable_system section of the working config, created if missing.
+
+    Changes to it land in session state directly; no ``set_config`` is needed.
+    """
+    return st.session_state.setdefault("config", {}).setdefault("viable_system", {})
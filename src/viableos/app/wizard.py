@@ -24,11 +24,20 @@ from viableos.app.state import (
     TOOL_CATEGORIES,
     VALUE_PRESETS,
     get_config,
+    edit_vs,
     get_vs,
     load_template,
+    parse_csv,
     set_config,
 )
-from viableos.budget import AGENT_RELIABILITY_LABELS, MODEL_CATALOG, MODEL_WARNINGS, calculate_budget, get_all_models
+from viableos.budget import (
+    AGENT_RELIABILITY_LABELS,
+    MODEL_CATALOG,
+    MODEL_WARNINGS,
+    BudgetPlan,
+    calculate_budget,
+    get_all_models,
+)
 from viableos.coordination import generate_base_rules
 
 TOTAL_STEPS = 6
@@ -41,50 +50,60 @@ def _go(step: int) -> None:
 def render_wizard() -> None:
     """Main wizard renderer — dispatches to the current step."""
     step = st.session_state.get("wizard_step", 0)
-    steps = [_step_template, _step_identity, _step_customize, _step_budget, _step_hitl, _step_review]
-
-    if 0 <= step < len(steps):
-        steps[step]()
+    if 0 <= step < TOTAL_STEPS:
+        _STEPS[step]()
 
 
 # ── Step 0: Choose a Template ────────────────────────────────────────────────
 
-def _step_template() -> None:
-    step_header(0, TOTAL_STEPS, "Choose Your Starting Point",
-                "Pick a template to pre-fill your setup, or start from scratch.")
-
-    selected = st.session_state.get("template_key")
-
-    cols = st.columns(4)
-    for i, (key, info) in enumerate(TEMPLATE_INFO.items()):
-        col = cols[i % 4]
-        with col:
-            is_selected = selected == key
-            border_color = "#6366f1" if is_selected else "#334155"
-            check = " [selected]" if is_selected else ""
-            is_custom = key == "custom"
-
-            bg = "#1a1a3e" if is_custom else "#1e293b"
-
-            st.markdown(
-                f"""<div style="padding: 14px; border-radius: 10px;
+_TEMPLATE_CARD_TMPL = """<div style="padding: 14px; border-radius: 10px;
                 border: 2px solid {border_color};
                 margin-bottom: 10px; background: {bg};">
                 <div style="font-weight: 700; color: #f8fafc; font-size: 14px;">
-                    {info['name']}{check}
+                    {name}{check}
                 </div>
                 <div style="font-size: 11px; color: #94a3b8; margin: 4px 0;">
-                    {info['tagline']}
+                    {tagline}
                 </div>
                 <div style="font-size: 11px; color: #64748b;">
-                    {info['description']}{f" | {info['units']} units" if info['units'] else ''}
+                    {details}
                 </div>
-                </div>""",
-                unsafe_allow_html=True,
-            )
+                </div>"""
+
+
+def _template_card_html(key: str, info: dict, is_selected: bool) -> str:
+    return _TEMPLATE_CARD_TMPL.format(
+        border_color="#6366f1" if is_selected else "#334155",
+        bg="#1a1a3e" if key == "custom" else "#1e293b",
+        name=info["name"],
+        check=" [selected]" if is_selected else "",
+        tagline=info["tagline"],
+        details=info["description"] + (f" | {info['units']} units" if info["units"] else ""),
+    )
+
+
+# Every card in both selection states, rendered once at import in display
+# order: (key, button key, {is_selected: html}). Reruns only pick one.
+_TEMPLATE_CARDS = tuple(
+    (key, f"tpl_{key}", {state: _template_card_html(key, info, state) for state in (False, True)})
+    for key, info in TEMPLATE_INFO.items()
+)
+
+
+def _step_template() -> None:
+    step_header(0, TOTAL_STEPS, "Choose Your Starting Point",
+                "Pick a template to pre-fill your setup, or start from scratch.")
+
+    selected = st.session_state.get("template_key")
+
+    cols = st.columns(4)
+    for i, (key, button_key, card_html) in enumerate(_TEMPLATE_CARDS):
+        with cols[i % 4]:
+            is_selected = selected == key
+            st.markdown(card_html[is_selected], unsafe_allow_html=True)
             if st.button(
                 "Selected" if is_selected else "Select",
-                key=f"tpl_{key}",
+                key=button_key,
                 use_container_width=True,
                 type="primary" if is_selected else "secondary",
             ):
@@ -121,6 +140,19 @@ def _step_template() -> None:
 
 # ── Step 1: Identity ────────────────────────────────────────────────────────
 
+_VALUE_PRESET_SET = frozenset(VALUE_PRESETS)
+_NEVER_DO_PRESET_SET = frozenset(NEVER_DO_PRESETS)
+
+
+def _split_presets(items: list[str], presets: frozenset[str]) -> tuple[list[str], list[str]]:
+    """Partition existing items into (known presets, custom entries) in one pass."""
+    known: list[str] = []
+    custom: list[str] = []
+    for item in items:
+        (known if item in presets else custom).append(item)
+    return known, custom
+
+
 def _step_identity() -> None:
     step_header(1, TOTAL_STEPS, "Your Organization",
                 "Name your system, describe its purpose, pick values, and set hard boundaries.")
@@ -143,8 +175,7 @@ def _step_identity() -> None:
     st.markdown("**Core values** — pick from the list, or add your own below")
 
     existing_values = vs.get("identity", {}).get("values", [])
-    known_selected = [v for v in existing_values if v in VALUE_PRESETS]
-    custom_existing = [v for v in existing_values if v not in VALUE_PRESETS]
+    known_selected, custom_existing = _split_presets(existing_values, _VALUE_PRESET_SET)
 
     selected_values = multi_select_chips(
         "Select values",
@@ -158,7 +189,7 @@ def _step_identity() -> None:
         value=", ".join(custom_existing),
         placeholder="e.g. Move fast and learn, Respect everyone's time",
     )
-    custom_values = [v.strip() for v in custom_values_str.split(",") if v.strip()] if custom_values_str else []
+    custom_values = parse_csv(custom_values_str)
     all_values = selected_values + [v for v in custom_values if v not in selected_values]
 
     # ── "What should agents NEVER do?" — Painpoint #2 & #7 ──────────────
@@ -170,8 +201,7 @@ def _step_identity() -> None:
     )
 
     existing_never = vs.get("identity", {}).get("never_do", [])
-    known_never = [n for n in existing_never if n in NEVER_DO_PRESETS]
-    custom_never_existing = [n for n in existing_never if n not in NEVER_DO_PRESETS]
+    known_never, custom_never_existing = _split_presets(existing_never, _NEVER_DO_PRESET_SET)
 
     selected_never = st.multiselect(
         "Select boundaries",
@@ -186,7 +216,7 @@ def _step_identity() -> None:
         value=", ".join(custom_never_existing),
         placeholder="e.g. Never contact customers directly, Never modify billing system",
     )
-    custom_never = [n.strip() for n in custom_never_str.split(",") if n.strip()] if custom_never_str else []
+    custom_never = parse_csv(custom_never_str)
     all_never = selected_never + [n for n in custom_never if n not in selected_never]
 
     can_proceed = bool(name and purpose)
@@ -196,16 +226,13 @@ def _step_identity() -> None:
         _go(0)
         st.rerun()
     if nxt and can_proceed:
-        config = get_config()
-        config.setdefault("viable_system", {})
-        config["viable_system"]["name"] = name
-        config["viable_system"]["runtime"] = "openclaw"
-        config["viable_system"].setdefault("identity", {})
-        config["viable_system"]["identity"]["purpose"] = purpose
-        if all_values:
-            config["viable_system"]["identity"]["values"] = all_values
-        config["viable_system"]["identity"]["never_do"] = all_never
-        set_config(config)
+        vs = edit_vs()
+        vs.update(name=name, runtime="openclaw")
+        vs.setdefault("identity", {}).update(
+            purpose=purpose,
+            **({"values": all_values} if all_values else {}),
+            never_do=all_never,
+        )
         _go(2)
         st.rerun()
 
@@ -216,8 +243,7 @@ def _step_customize() -> None:
     step_header(2, TOTAL_STEPS, "Customize Your Teams",
                 "These are your operational units — the agents that do the actual work.")
 
-    config = get_config()
-    vs = config.get("viable_system", {})
+    vs = edit_vs()
     units = vs.get("system_1", [])
 
     # Rollout guidance — Painpoint #6
@@ -236,8 +262,7 @@ def _step_customize() -> None:
 
     if not units:
         units = [{"name": "", "purpose": "", "autonomy": "", "tools": []}]
-        config["viable_system"]["system_1"] = units
-        set_config(config)
+        vs["system_1"] = units
 
     edited_units = []
     for i, unit in enumerate(units):
@@ -249,14 +274,12 @@ def _step_customize() -> None:
     with col1:
         if st.button("+ Add a unit"):
             units.append({"name": "", "purpose": "", "autonomy": "", "tools": []})
-            config["viable_system"]["system_1"] = units
-            set_config(config)
+            vs["system_1"] = units
             st.rerun()
     with col2:
         if len(units) > 1 and st.button("- Remove last unit"):
             units.pop()
-            config["viable_system"]["system_1"] = units
-            set_config(config)
+            vs["system_1"] = units
             st.rerun()
 
     # Auto-generated S2 rules preview — Painpoint #2
@@ -285,8 +308,7 @@ def _step_customize() -> None:
         _go(1)
         st.rerun()
     if nxt and has_valid_units:
-        config["viable_system"]["system_1"] = edited_units
-        set_config(config)
+        vs["system_1"] = edited_units
         _go(3)
         st.rerun()
 
@@ -311,19 +333,85 @@ SYSTEM_DESCRIPTIONS = {
     "S5 Policy Guardian": "Enforces values, prepares human decisions \u2014 needs precision",
 }
 
+# Per-system selector labels and widget keys: (routing key, expander, selector, key).
+_SYSTEM_SELECTORS = tuple(
+    (
+        routing_key,
+        f"**{sys_label}** \u2014 {SYSTEM_DESCRIPTIONS[sys_label]}",
+        f"Model for {sys_label}",
+        f"sys_model_{routing_key}",
+    )
+    for sys_label, routing_key in SYSTEM_MODEL_KEYS.items()
+)
+
+_STRATEGY_LABELS = {
+    "frugal": "Frugal \u2014 cheapest models, good for testing",
+    "balanced": "Balanced \u2014 smart routing, recommended",
+    "performance": "Performance \u2014 best models everywhere",
+}
+_STRATEGIES = tuple(_STRATEGY_LABELS)
+_STRATEGY_IDX = {strategy: i for i, strategy in enumerate(_STRATEGIES)}
+
+_PROVIDER_LABELS = {
+    "anthropic": "Anthropic (Claude)",
+    "openai": "OpenAI (GPT-5.x, Codex, o3)",
+    "google": "Google (Gemini)",
+    "deepseek": "DeepSeek",
+    "xai": "xAI (Grok)",
+    "meta": "Meta (Llama)",
+    "mixed": "Mixed (pick per system)",
+    "ollama": "Ollama (local models)",
+}
+_PROVIDER_KEYS = tuple(_PROVIDER_LABELS)
+_PROVIDER_IDX = {key: i for i, key in enumerate(_PROVIDER_KEYS)}
+
+
+# The catalog is fixed per process: build the selectbox options and the
+# model -> option index map once instead of per selector per rerun.
+_MODEL_OPTIONS = (_AUTO, *get_all_models())
+_MODEL_IDX = {model: i for i, model in enumerate(_MODEL_OPTIONS) if i}
 
-def _model_selector(label: str, current: str, all_models: list[str], key: str) -> str:
+
+def _model_caption(model: str) -> str:
+    info = MODEL_CATALOG.get(model, {})
+    reliability = info.get("agent_reliability", "unknown")
+    reliability_label = AGENT_RELIABILITY_LABELS.get(reliability, reliability)
+    return f"{info.get('tier', '').title()} \u2014 {info.get('note', '')} | Agent reliability: {reliability_label}"
+
+
+_MODEL_CAPTIONS = {model: _model_caption(model) for model in _MODEL_OPTIONS[1:]}
+
+# Every possible budget preview bar, indexed by filled width (0-50).
+_BARS = tuple("\u2588" * i + "\u2591" * (50 - i) for i in range(51))
+
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def _preview_budget(
+    monthly: int,
+    strategy: str,
+    routing: tuple[tuple[str, str], ...],
+    units: tuple[tuple[str, str | None, int], ...],
+) -> BudgetPlan:
+    """Budget for the live preview, keyed on exactly the inputs calculate_budget reads.
+
+    Widget interactions that leave these unchanged (expanders, alert
+    thresholds, other steps' reruns) reuse the previous plan.
+    """
+    return calculate_budget({
+        "viable_system": {
+            "budget": {"monthly_usd": monthly, "strategy": strategy},
+            "model_routing": dict(routing),
+            "system_1": [{"name": name, "model": model, "weight": weight} for name, model, weight in units],
+        }
+    })
+
+
+def _model_selector(label: str, current: str, key: str) -> str:
     """Reusable model selectbox with auto option and warnings. Returns model ID or empty string."""
-    options = [_AUTO] + all_models
-    idx = 0
-    if current and current in all_models:
-        idx = all_models.index(current) + 1
-    selected = st.selectbox(label, options=options, index=idx, key=key, label_visibility="collapsed")
+    idx = _MODEL_IDX.get(current, 0)
+    selected = st.selectbox(label, options=_MODEL_OPTIONS, index=idx, key=key, label_visibility="collapsed")
     if selected != _AUTO:
-        info = MODEL_CATALOG.get(selected, {})
-        reliability = info.get("agent_reliability", "unknown")
-        reliability_label = AGENT_RELIABILITY_LABELS.get(reliability, reliability)
-        st.caption(f"{info.get('tier', '').title()} \u2014 {info.get('note', '')} | Agent reliability: {reliability_label}")
+        st.caption(_MODEL_CAPTIONS[selected])
 
         if selected in MODEL_WARNINGS:
             st.warning(MODEL_WARNINGS[selected], icon="\u26a0\ufe0f")
@@ -350,14 +438,11 @@ def _step_budget() -> None:
         unsafe_allow_html=True,
     )
 
-    config = get_config()
-    vs = config.get("viable_system", {})
+    vs = edit_vs()
     budget = vs.get("budget", {})
     routing = vs.get("model_routing", {})
     units = vs.get("system_1", [])
 
-    all_models = get_all_models()
-
     # ── Global settings ──────────────────────────────────────────────────
     st.markdown("#### Global settings")
 
@@ -371,36 +456,19 @@ def _step_budget() -> None:
             step=10,
         )
     with col_strategy:
-        strategy_labels = {
-            "frugal": "Frugal \u2014 cheapest models, good for testing",
-            "balanced": "Balanced \u2014 smart routing, recommended",
-            "performance": "Performance \u2014 best models everywhere",
-        }
         strategy = st.radio(
             "Strategy",
-            options=["frugal", "balanced", "performance"],
-            format_func=lambda x: strategy_labels[x],
-            index=["frugal", "balanced", "performance"].index(budget.get("strategy", "balanced")),
+            options=_STRATEGIES,
+            format_func=_STRATEGY_LABELS.__getitem__,
+            index=_STRATEGY_IDX.get(budget.get("strategy", "balanced"), _STRATEGY_IDX["balanced"]),
         )
 
     st.markdown("#### Default provider")
-    provider_labels = {
-        "anthropic": "Anthropic (Claude)",
-        "openai": "OpenAI (GPT-5.x, Codex, o3)",
-        "google": "Google (Gemini)",
-        "deepseek": "DeepSeek",
-        "xai": "xAI (Grok)",
-        "meta": "Meta (Llama)",
-        "mixed": "Mixed (pick per system)",
-        "ollama": "Ollama (local models)",
-    }
-    provider_keys = list(provider_labels.keys())
-    current_provider = routing.get("provider_preference", "anthropic")
     provider = st.radio(
         "Default provider",
-        options=provider_keys,
-        format_func=lambda x: provider_labels[x],
-        index=provider_keys.index(current_provider) if current_provider in provider_keys else 0,
+        options=_PROVIDER_KEYS,
+        format_func=_PROVIDER_LABELS.__getitem__,
+        index=_PROVIDER_IDX.get(routing.get("provider_preference", "anthropic"), 0),
         horizontal=True,
         label_visibility="collapsed",
     )
@@ -419,7 +487,7 @@ def _step_budget() -> None:
         with st.expander(f"**{uname}** \u2014 {unit.get('purpose', '')[:50]}", expanded=False):
             c1, c2 = st.columns([3, 1])
             with c1:
-                sel = _model_selector(f"Model for {uname}", current_model, all_models, f"unit_model_{i}")
+                sel = _model_selector(f"Model for {uname}", current_model, f"unit_model_{i}")
             with c2:
                 weight = st.slider(
                     "Budget weight",
@@ -446,15 +514,10 @@ def _step_budget() -> None:
 
     updated_routing: dict[str, str] = {}
 
-    for sys_label, routing_key in SYSTEM_MODEL_KEYS.items():
+    for routing_key, expander_label, selector_label, widget_key in _SYSTEM_SELECTORS:
         current = routing.get(routing_key, "")
-        with st.expander(f"**{sys_label}** \u2014 {SYSTEM_DESCRIPTIONS[sys_label]}", expanded=False):
-            sel = _model_selector(
-                f"Model for {sys_label}",
-                current,
-                all_models,
-                f"sys_model_{routing_key}",
-            )
+        with st.expander(expander_label, expanded=False):
+            sel = _model_selector(selector_label, current, widget_key)
             if sel:
                 updated_routing[routing_key] = sel
 
@@ -472,54 +535,74 @@ def _step_budget() -> None:
     st.divider()
     st.markdown("#### Budget preview (live)")
 
-    preview_routing = {"provider_preference": provider, **updated_routing}
-    preview_config = {
-        "viable_system": {
-            **vs,
-            "system_1": updated_units,
-            "budget": {"monthly_usd": monthly, "strategy": strategy},
-            "model_routing": preview_routing,
-        }
-    }
-    plan = calculate_budget(preview_config)
+    plan = _preview_budget(
+        monthly,
+        strategy,
+        (("provider_preference", provider), *updated_routing.items()),
+        tuple((u.get("name", "?"), u.get("model"), u.get("weight", 5)) for u in updated_units),
+    )
 
-    for alloc in plan.allocations:
-        pct_bar = int(alloc.percentage / 2)
-        bar = "\u2588" * pct_bar + "\u2591" * (50 - pct_bar)
-        model_short = alloc.model.split("/")[-1] if "/" in alloc.model else alloc.model
-        st.text(f"  {alloc.system:<20} {bar} ${alloc.monthly_usd:>5.0f}/mo  {model_short}")
+    # One preformatted text element for all rows instead of one per allocation.
+    st.text("\n".join(
+        f"  {alloc.system:<20} {_BARS[min(50, int(alloc.percentage / 2))]} "
+        f"${alloc.monthly_usd:>5.0f}/mo  {alloc.model.rsplit('/', 1)[-1]}"
+        for alloc in plan.allocations
+    ))
 
     back, nxt = nav_buttons(3, TOTAL_STEPS)
     if back:
         _go(2)
         st.rerun()
     if nxt:
-        config["viable_system"]["system_1"] = updated_units
-        config["viable_system"]["budget"] = {
-            "monthly_usd": monthly,
-            "strategy": strategy,
-            "alerts": [
-                {"at_percent": warn_pct, "action": "notify"},
-                {"at_percent": limit_pct, "action": "downgrade_models"},
-            ],
-        }
-        config["viable_system"]["model_routing"] = {
-            "provider_preference": provider,
-            **updated_routing,
-        }
-        set_config(config)
+        vs.update(
+            system_1=updated_units,
+            budget={
+                "monthly_usd": monthly,
+                "strategy": strategy,
+                "alerts": [
+                    {"at_percent": warn_pct, "action": "notify"},
+                    {"at_percent": limit_pct, "action": "downgrade_models"},
+                ],
+            },
+            model_routing={
+                "provider_preference": provider,
+                **updated_routing,
+            },
+        )
         _go(4)
         st.rerun()
 
 
 # ── Step 4: Human-in-the-Loop ──────────────────────────────────────────────
 
+_CHANNEL_IDX = {channel: i for i, channel in enumerate(NOTIFICATION_CHANNELS)}
+
+
+def _norm_item(item: str) -> str:
+    return item.lower().replace(" ", "_")
+
+
+def _normed(presets: list[str]) -> tuple[tuple[str, str], ...]:
+    return tuple((p, _norm_item(p)) for p in presets)
+
+
+# (preset, normalized preset) pairs, normalized once at import.
+_APPROVAL_NORMED = _normed(APPROVAL_PRESETS)
+_REVIEW_NORMED = _normed(REVIEW_PRESETS)
+_EMERGENCY_NORMED = _normed(EMERGENCY_PRESETS)
+
+
+def _matching_presets(presets: tuple[tuple[str, str], ...], existing: list[str]) -> list[str]:
+    """Presets already in the config, compared case- and space/underscore-insensitively."""
+    existing_norm = {_norm_item(e) for e in existing}
+    return [p for p, norm in presets if norm in existing_norm]
+
+
 def _step_hitl() -> None:
     step_header(4, TOTAL_STEPS, "Human-in-the-Loop & Persistence",
                 "Safety config: when agents ask you, and how they remember across sessions.")
 
-    config = get_config()
-    vs = config.get("viable_system", {})
+    vs = edit_vs()
     hitl = vs.get("human_in_the_loop", {})
 
     # Notification channel
@@ -528,7 +611,7 @@ def _step_hitl() -> None:
     channel = st.radio(
         "Notification channel",
         options=NOTIFICATION_CHANNELS,
-        index=NOTIFICATION_CHANNELS.index(current_channel) if current_channel in NOTIFICATION_CHANNELS else 0,
+        index=_CHANNEL_IDX.get(current_channel, 0),
         horizontal=True,
         label_visibility="collapsed",
     )
@@ -539,10 +622,7 @@ def _step_hitl() -> None:
     st.caption("Agents will **stop and wait** for your OK before doing these things.")
 
     existing_approval = hitl.get("approval_required", [])
-    default_approval = [p for p in APPROVAL_PRESETS if any(
-        p.lower().replace(" ", "_") == a.lower().replace(" ", "_") or p == a
-        for a in existing_approval
-    )] or APPROVAL_PRESETS[:3]
+    default_approval = _matching_presets(_APPROVAL_NORMED, existing_approval) or APPROVAL_PRESETS[:3]
 
     approval_selected = st.multiselect(
         "Select approval items",
@@ -556,7 +636,7 @@ def _step_hitl() -> None:
         key="hitl_approval_custom",
         placeholder="e.g. database migrations, API key rotations",
     )
-    extra_approval = [a.strip() for a in approval_custom.split(",") if a.strip()] if approval_custom else []
+    extra_approval = parse_csv(approval_custom)
     all_approval = approval_selected + extra_approval
 
     # Review required
@@ -565,10 +645,7 @@ def _step_hitl() -> None:
     st.caption("Agents can proceed, but they will share results for you to check.")
 
     existing_review = hitl.get("review_required", [])
-    default_review = [p for p in REVIEW_PRESETS if any(
-        p.lower().replace(" ", "_") == r.lower().replace(" ", "_") or p == r
-        for r in existing_review
-    )] or REVIEW_PRESETS[:2]
+    default_review = _matching_presets(_REVIEW_NORMED, existing_review) or REVIEW_PRESETS[:2]
 
     review_selected = st.multiselect(
         "Select review items",
@@ -582,7 +659,7 @@ def _step_hitl() -> None:
         key="hitl_review_custom",
         placeholder="e.g. partner contracts, investor updates",
     )
-    extra_review = [r.strip() for r in review_custom.split(",") if r.strip()] if review_custom else []
+    extra_review = parse_csv(review_custom)
     all_review = review_selected + extra_review
 
     # Emergency alerts
@@ -591,10 +668,7 @@ def _step_hitl() -> None:
     st.caption("These **interrupt you immediately**, no matter what.")
 
     existing_emergency = hitl.get("emergency_alerts", [])
-    default_emergency = [p for p in EMERGENCY_PRESETS if any(
-        p.lower().replace(" ", "_") == e.lower().replace(" ", "_") or p == e
-        for e in existing_emergency
-    )] or EMERGENCY_PRESETS[:3]
+    default_emergency = _matching_presets(_EMERGENCY_NORMED, existing_emergency) or EMERGENCY_PRESETS[:3]
 
     emergency_selected = st.multiselect(
         "Select emergency items",
@@ -608,7 +682,7 @@ def _step_hitl() -> None:
         key="hitl_emergency_custom",
         placeholder="e.g. failed payment processing",
     )
-    extra_emergency = [e.strip() for e in emergency_custom.split(",") if e.strip()] if emergency_custom else []
+    extra_emergency = parse_csv(emergency_custom)
     all_emergency = emergency_selected + extra_emergency
 
     # ── Persistence — Painpoint #3 ────────────────────────────────────────
@@ -644,24 +718,31 @@ def _step_hitl() -> None:
         _go(3)
         st.rerun()
     if nxt:
-        config["viable_system"]["human_in_the_loop"] = {
-            "notification_channel": channel,
-            "approval_required": all_approval,
-            "review_required": all_review,
-            "emergency_alerts": all_emergency,
-        }
-        config["viable_system"]["persistence"] = {
-            "strategy": persistence_choice,
-        }
-        if persistence_path:
-            config["viable_system"]["persistence"]["path"] = persistence_path
-        set_config(config)
+        vs.update(
+            human_in_the_loop={
+                "notification_channel": channel,
+                "approval_required": all_approval,
+                "review_required": all_review,
+                "emergency_alerts": all_emergency,
+            },
+            persistence={
+                "strategy": persistence_choice,
+                **({"path": persistence_path} if persistence_path else {}),
+            },
+        )
         _go(5)
         st.rerun()
 
 
 # ── Step 5: Review & Warnings ────────────────────────────────────────────
 
+_SEVERITY_COLORS = {
+    "critical": "#ef4444",
+    "warning": "#f59e0b",
+    "info": "#6366f1",
+}
+
+
 def _step_review() -> None:
     step_header(5, TOTAL_STEPS, "Review & Warnings",
                 "Check your configuration against community best practices before generating.")
@@ -693,14 +774,8 @@ def _step_review() -> None:
         st.markdown(f"#### Warnings ({len(report.warnings)})")
         st.caption("Based on real-world community experience with multi-agent systems.")
 
-        severity_colors = {
-            "critical": "#ef4444",
-            "warning": "#f59e0b",
-            "info": "#6366f1",
-        }
-
         for warning in report.warnings:
-            color = severity_colors.get(warning.severity, "#64748b")
+            color = _SEVERITY_COLORS.get(warning.severity, "#64748b")
             st.markdown(
                 f"""<div style="padding:10px 14px;border-radius:8px;border-left:4px solid {color};
                 background:#1e293b;margin-bottom:8px;">
@@ -764,3 +839,7 @@ def _step_review() -> None:
     if nxt:
         st.session_state["view"] = "dashboard"
         st.rerun()
+
+
+# Dispatch table for render_wizard, indexed by wizard_step.
+_STEPS = (_step_template, _step_identity, _step_customize, _step_budget, _step_hitl, _step_review)
@@ -158,7 +158,7 @@ PROVIDER_OVERRIDES: dict[str, dict[str, str]] = {
 }
 
 
-@dataclass
+@dataclass(slots=True)
 class BudgetAllocation:
     system: str
     friendly_name: str
@@ -167,7 +167,7 @@ class BudgetAllocation:
     percentage: float
 
 
-@dataclass
+@dataclass(slots=True)
 class BudgetPlan:
     total_monthly_usd: float
     strategy: str
@@ -12,7 +12,7 @@ from typing import Any
 from viableos.budget import MODEL_WARNINGS
 
 
-@dataclass
+@dataclass(slots=True)
 class CheckResult:
     system: str
     name: str
@@ -21,7 +21,7 @@ class CheckResult:
     suggestions: list[str] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class Warning:
     category: str
     severity: str  # "info", "warning", "critical"
@@ -29,7 +29,7 @@ class Warning:
     suggestion: str = ""
 
 
-@dataclass
+@dataclass(slots=True)
 class ViabilityReport:
     score: int
     total: int
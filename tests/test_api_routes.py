@@ -0,0 +1,202 @@
+"""Tests for the wizard/config API routes."""
+
+import pytest
+
+from viableos.api.routes import TEMPLATE_INFO, VALUE_PRESETS
+from viableos.budget import MODEL_CATALOG, MODEL_WARNINGS
+
+
+@pytest.fixture
+def client():
+    from fastapi.testclient import TestClient
+
+    from viableos.api.main import app
+    return TestClient(app)
+
+
+# ── Read endpoints ───────────────────────────────────────────
+
+
+class TestReadRoutes:
+    def test_list_templates(self, client):
+        resp = client.get("/api/templates")
+        assert resp.status_code == 200
+        assert resp.headers["content-type"] == "application/json"
+        data = resp.json()
+        assert [t["key"] for t in data] == list(TEMPLATE_INFO)
+        assert data[1]["name"] == TEMPLATE_INFO["saas-startup"]["name"]
+        assert data[1]["units"] == 3
+
+    def test_get_template(self, client):
+        resp = client.get("/api/templates/saas-startup")
+        assert resp.status_code == 200
+        assert resp.json()["viable_system"]["name"]
+
+    def test_get_custom_template(self, client):
+        resp = client.get("/api/templates/custom")
+        assert resp.status_code == 200
+        assert resp.json()["viable_system"]["system_1"] == []
+
+    def test_get_unknown_template_returns_404(self, client):
+        resp = client.get("/api/templates/does-not-exist")
+        assert resp.status_code == 404
+
+    def test_list_models(self, client):
+        resp = client.get("/api/models")
+        assert resp.status_code == 200
+        data = resp.json()
+        assert len(data) == len(MODEL_CATALOG)
+        by_id = {m["id"]: m for m in data}
+        mini = by_id["openai/gpt-5-mini"]
+        assert mini["warning"] == MODEL_WARNINGS["openai/gpt-5-mini"]
+        assert by_id["anthropic/claude-opus-4-6"]["warning"] is None
+
+    @pytest.mark.parametrize("provider", ["anthropic", "openai", "mixed", "nobody"])
+    def test_list_models_by_provider(self, client, provider):
+        from viableos.budget import get_models_for_provider
+
+        resp = client.get(f"/api/models/{provider}")
+        assert resp.status_code == 200
+        assert resp.json() == get_models_for_provider(provider)
+
+    def test_presets(self, client):
+        resp = client.get("/api/presets")
+        assert resp.status_code == 200
+        assert resp.headers["content-type"] == "application/json"
+        data = resp.json()
+        assert data["values"] == VALUE_PRESETS
+        assert data["strategy_presets"] == ["frugal", "balanced", "performance"]
+
+    def test_get_template_is_parsed_once(self, client):
+        from viableos.api.routes import _load_template_json
+
+        _load_template_json.cache_clear()
+        first = client.get("/api/templates/ecommerce")
+        second = client.get("/api/templates/ecommerce")
+        assert first.json() == second.json()
+        assert _load_template_json.cache_info().misses == 1
+
+    @pytest.mark.parametrize("path", [
+        "/api/templates", "/api/templates/saas-startup", "/api/templates/custom",
+        "/api/models", "/api/models/anthropic", "/api/presets",
+    ])
+    def test_etag_revalidation(self, client, path):
+        first = client.get(path)
+        etag = first.headers["etag"]
+        assert first.headers["cache-control"] == "public, max-age=300"
+
+        cached = client.get(path, headers={"If-None-Match": etag})
+        assert cached.status_code == 304
+        assert cached.content == b""
+        assert cached.headers["etag"] == etag
+
+        stale = client.get(path, headers={"If-None-Match": '"stale"'})
+        assert stale.status_code == 200
+        assert stale.content == first.content
+
+
+# ── Config endpoints ─────────────────────────────────────────
+
+
+MINIMAL_CONFIG = {
+    "viable_system": {
+        "name": "Test Org",
+        "identity": {"purpose": "Test"},
+        "system_1": [{"name": "Unit1", "purpose": "Do work"}],
+        "budget": {"monthly_usd": 200, "strategy": "balanced"},
+    }
+}
+
+
+class TestConfigRoutes:
+    def test_budget(self, client):
+        resp = client.post("/api/budget", json=MINIMAL_CONFIG)
+        assert resp.status_code == 200
+        assert resp.headers["content-type"] == "application/json"
+        data = resp.json()
+        assert data["total_monthly_usd"] == 200
+        assert data["strategy"] == "balanced"
+        assert [a["system"] for a in data["allocations"]] == [
+            "S1:Unit1", "S2", "S3", "S3*", "S4", "S5",
+        ]
+        assert "s1_routine" in data["model_routing"]
+
+    def test_check(self, client):
+        resp = client.post("/api/check", json=MINIMAL_CONFIG)
+        assert resp.status_code == 200
+        data = resp.json()
+        assert data["total"] == len(data["checks"])
+        assert {"system", "name", "present", "details", "suggestions"} <= set(data["checks"][0])
+        assert all({"category", "severity", "message", "suggestion"} <= set(w) for w in data["warnings"])
+
+    def test_validate(self, client):
+        resp = client.post("/api/validate", json=MINIMAL_CONFIG)
+        assert resp.status_code == 200
+        assert resp.json() == []
+
+    def test_validate_reports_errors(self, client):
+        resp = client.post("/api/validate", json={"invalid": True})
+        assert resp.status_code == 200
+        assert resp.json()
+
+    @pytest.mark.parametrize("path", ["/api/validate", "/api/budget", "/api/check", "/api/prepare"])
+    @pytest.mark.parametrize("body", [b"{not json", b"[1, 2]"])
+    def test_config_endpoints_reject_bad_bodies(self, client, path, body):
+        resp = client.post(path, content=body, headers={"content-type": "application/json"})
+        assert resp.status_code == 422
+
+    def test_prepare_combines_validate_and_budget(self, client):
+        resp = client.post("/api/prepare", json=MINIMAL_CONFIG)
+        assert resp.status_code == 200
+        data = resp.json()
+        assert data["errors"] == []
+        assert data["budget"] == client.post("/api/budget", json=MINIMAL_CONFIG).json()
+
+    def test_prepare_reports_errors(self, client):
+        resp = client.post("/api/prepare", json={"invalid": True})
+        assert resp.status_code == 200
+        assert resp.json()["errors"]
+
+    @pytest.mark.parametrize("config", [
+        {"viable_system": {"budget": {"monthly_usd": "abc"}}},
+        {"viable_system": []},
+        {"viable_system": {"system_1": "x"}},
+    ])
+    def test_prepare_reports_errors_for_unbudgetable_config(self, client, config):
+        resp = client.post("/api/prepare", json=config)
+        assert resp.status_code == 200
+        data = resp.json()
+        assert data["errors"] == client.post("/api/validate", json=config).json()
+        assert data["errors"]
+        assert data["budget"] is None
+
+    def test_coordination_rules(self, client):
+        units = [{"name": "Alpha"}, {"name": "Beta"}]
+        resp = client.post("/api/coordination/rules", json=units)
+        assert resp.status_code == 200
+        rules = resp.json()
+        assert any("Alpha" in r["trigger"] for r in rules)
+        assert all(set(r) == {"trigger", "action", "scope"} for r in rules)
+
+
+# ── Package generation ───────────────────────────────────────
+
+
+class TestGenerateRoute:
+    def test_generate_returns_zip(self, client):
+        import io
+        import zipfile
+
+        resp = client.post("/api/generate", json=MINIMAL_CONFIG)
+        assert resp.status_code == 200
+        assert resp.headers["content-type"] == "application/zip"
+        assert 'filename="viableos-openclaw.zip"' in resp.headers["content-disposition"]
+        with zipfile.ZipFile(io.BytesIO(resp.content)) as zf:
+            names = zf.namelist()
+            assert zf.testzip() is None
+        assert names
+        assert not any(n.startswith("viableos-openclaw/") for n in names)
+
+    def test_generate_invalid_config(self, client):
+        resp = client.post("/api/generate", json={"invalid": True})
+        assert resp.status_code == 422
@@ -0,0 +1,50 @@
+"""Tests for the CORS middleware."""
+
+import pytest
+
+ORIGIN = "http://localhost:5173"
+
+
+@pytest.fixture
+def client():
+    from fastapi.testclient import TestClient
+
+    from viableos.api.main import app
+    return TestClient(app)
+
+
+class TestCORSMiddleware:
+    def test_no_origin_passes_through(self, client):
+        resp = client.get("/health")
+        assert resp.status_code == 200
+        assert "access-control-allow-origin" not in resp.headers
+
+    def test_allowed_origin_gets_headers(self, client):
+        resp = client.get("/health", headers={"Origin": ORIGIN})
+        assert resp.status_code == 200
+        assert resp.headers["access-control-allow-origin"] == ORIGIN
+        assert resp.headers["access-control-allow-credentials"] == "true"
+        assert "Origin" in resp.headers["vary"]
+
+    def test_disallowed_origin_gets_no_headers(self, client):
+        resp = client.get("/health", headers={"Origin": "http://evil.example"})
+        assert resp.status_code == 200
+        assert "access-control-allow-origin" not in resp.headers
+
+    def test_preflight(self, client):
+        resp = client.options("/api/budget", headers={
+            "Origin": ORIGIN,
+            "Access-Control-Request-Method": "POST",
+            "Access-Control-Request-Headers": "content-type",
+        })
+        assert resp.status_code == 204
+        assert resp.headers["access-control-allow-origin"] == ORIGIN
+        assert "POST" in resp.headers["access-control-allow-methods"]
+        assert resp.headers["access-control-allow-headers"] == "content-type"
+
+    def test_preflight_disallowed_origin(self, client):
+        resp = client.options("/api/budget", headers={
+            "Origin": "http://evil.example",
+            "Access-Control-Request-Method": "POST",
+        })
+        assert resp.status_code == 400